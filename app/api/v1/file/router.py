@@ -1,7 +1,7 @@
 from uuid import UUID
 
 import fastapi as api
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.file import service
 from app.core.deps.auth import auth_user
@@ -11,7 +11,6 @@ from app.entities.dto.responses.audio_file import audio_file_model_to_schema
 from app.entities.dto.responses.project import project_model_to_schema
 from app.entities.repositories.file.base import AudioFileRepo
 from app.entities.repositories.project.base import ProjectRepo
-from app.entities.repositories.sss.base import SSSRepo
 from app.entities.schemas.audio_file import AudioFile
 from app.entities.schemas.auth_user import AuthUser
 from app.entities.schemas.events.audio_file_event import AudioFileEvent
@@ -23,6 +22,7 @@ from app.entities.types.enums.processing_status import ProcessingStatus
 from app.entities.types.enums.sorting import AudioFileSorting
 from app.entities.types.pagination import Paginated
 from app.shared.services.event_manager import EventManager
+from app.shared.services.file_urls import FileURLs
 
 router = api.APIRouter(prefix="/project")
 logger = get()
@@ -32,13 +32,9 @@ logger = get()
 async def files_events(
     project_id: UUID,
     user: AuthUser = api.Depends(auth_user),
-    db: Session = api.Depends(get_db),
+    db: AsyncSession = api.Depends(get_db),
 ) -> api.responses.StreamingResponse:
-    _ = ProjectRepo.instance.get_project_or_404(
-        db,
-        project_id,
-        user.id,
-    )
+    await ProjectRepo.instance.get_project_or_404(db, project_id, user.id)
     eid = user.id + str(project_id)
     gen = EventManager.get_stream(
         AudioFileEvent,
@@ -59,8 +55,10 @@ async def get_files(
     status: ProcessingStatus | None = api.Query(None),
     sort: AudioFileSorting = api.Query(AudioFileSorting.file_name),
     order: Ordering = api.Query(Ordering.desc),
+    cursor: str | None = api.Query(None),
+    total: bool | None = api.Query(None),
     user: AuthUser = api.Depends(auth_user),
-    db: Session = api.Depends(get_db),
+    db: AsyncSession = api.Depends(get_db),
 ) -> Paginated[AudioFile]:
     # project = await ProjectRepo.instance.get_project_or_404(
     #     db,
@@ -81,6 +79,8 @@ async def get_files(
         AudioFileListingParams(
             page=page,
             limit=limit,
+            cursor=cursor,
+            with_total=total,
             file_name=name,
             order=order,
             sort=sort,
@@ -89,8 +89,9 @@ async def get_files(
         mapper=lambda x: audio_file_model_to_schema(x, ""),
     )
 
-    for file in files["data"]:
-        file.public_url = SSSRepo.create_instance().get_public_url(file.file_path_raw)
+    urls = await FileURLs.get_many([file.file_path_raw for file in files["data"]])
+    for file, url in zip(files["data"], urls):
+        file.public_url = url
 
     return files
 
@@ -100,7 +101,7 @@ async def add_file(
     project_id: UUID,
     file: api.UploadFile = api.File(...),
     user: AuthUser = api.Depends(auth_user),
-    db: Session = api.Depends(get_db),
+    db: AsyncSession = api.Depends(get_db),
 ):
     project = await ProjectRepo.instance.get_project_or_404(
         db,
@@ -108,7 +109,7 @@ async def add_file(
         user.id,
     )
 
-    if project.status == ProcessingStatus.processing:
+    if project.status in (ProcessingStatus.queued, ProcessingStatus.processing):
         raise api.HTTPException(
             api.status.HTTP_409_CONFLICT, "Current project is processing. Please wait."
         )
@@ -119,13 +120,16 @@ async def add_file(
         project,
     )
 
+    # Inserted by the same commit as the project changes
+    db.add(audio_file)
+    await ProjectRepo.instance.bump_content_version(db, project.id)
     project = await ProjectRepo.instance.replace_project(
         db,
         project,
         user.id,
     )
 
-    public_url = SSSRepo.create_instance().get_public_url(audio_file.file_path_raw)
+    public_url = await FileURLs.get(audio_file.file_path_raw)
     EventManager.notify(
         AudioFileEvent.from_table(
             audio_file,
@@ -147,7 +151,7 @@ async def patch_file(
     file_id: UUID,
     body: UpdateAudioFileSchema,
     user: AuthUser = api.Depends(auth_user),
-    db: Session = api.Depends(get_db),
+    db: AsyncSession = api.Depends(get_db),
 ):
     logger.info(f"Updating file {file_id} for project {project_id}")
     logger.debug(f"Payload: {body.model_dump()}")
@@ -158,7 +162,7 @@ async def patch_file(
         logger.warning(f"Update failed, project {file_id} not found")
         raise api.HTTPException(api.status.HTTP_400_BAD_REQUEST, "File not found")
 
-    public_url = SSSRepo.create_instance().get_public_url(file.file_path_raw)
+    public_url = await FileURLs.get(file.file_path_raw)
     EventManager.notify(
         AudioFileEvent.from_table(
             file,
@@ -176,7 +180,7 @@ async def delete_file(
     project_id: UUID,
     file_id: UUID,
     user: AuthUser = api.Depends(auth_user),
-    db: Session = api.Depends(get_db),
+    db: AsyncSession = api.Depends(get_db),
 ):
     await ProjectRepo.instance.get_project_or_404(db, project_id, user.id)
     did_delete = await AudioFileRepo.instance.delete_file(db, file_id, user.id)
@@ -4,14 +4,21 @@ from tempfile import TemporaryDirectory
 from uuid import UUID, uuid4
 
 from fastapi import UploadFile, HTTPException, status
-from pydub import AudioSegment
-
 
+from app.core.config import Config
 from app.entities.models.audio_file import AudioFileTable
 from app.entities.models.project import ProjectTable
 from app.entities.repositories.sss.base import SSSRepo
 from app.entities.types.enums.processing_status import ProcessingStatus
-from app.shared.utils.other import bump_name, convert_to_wav
+from app.shared.services.ingest import transcribe_at_ingest
+from app.shared.utils.normalize import normalize_audio
+from app.shared.utils.other import (
+    audio_content_type,
+    bump_name,
+    hash_file,
+    save_upload,
+)
+from app.shared.utils.probe import probe
 
 
 async def add_file_to_project(
@@ -24,40 +31,70 @@ async def add_file_to_project(
             status.HTTP_422_UNPROCESSABLE_CONTENT,
             'Invalid file',
         )
-        
-    data = await file.read()
 
     with TemporaryDirectory() as tmp:
         tmp_path = Path(tmp)
-        file_path = tmp_path / file.filename
-        with file_path.open('wb') as f:
-            f.write(data)
-        wav_file = await convert_to_wav(file_path)
+        file_path = tmp_path / Path(file.filename).name
+        await save_upload(file, file_path, Config.MAX_UPLOAD_BYTES)
+        cleaned_file = await normalize_audio(
+            file_path, tmp_path / 'cleaned' / f'{file_path.stem}.wav'
+        )
 
         id = uuid4()
         now = datetime.datetime.now(datetime.UTC)
 
-        audio_data = AudioSegment.from_file(wav_file)
-        duration_ms = len(audio_data)
+        info = await probe(file_path)
         file_name = await generate_file_name(project.id, file_path.name)
         supa_path = f'{project.id}/raw/{file_name}'
+        # Keyed by the unique raw name, x.mp3 and x.wav must not share one.
+        # Uploads already in the audio profile are stored once
+        cleaned_path = (
+            supa_path if cleaned_file == file_path
+            else f'{project.id}/cleaned/{file_name}.wav'
+        )
+        content_hash = await hash_file(cleaned_file)
+        transcription = await transcribe_at_ingest(
+            cleaned_file, user_id, project.id, content_hash, info.duration_ms
+        )
         audio_file = AudioFileTable(
             id=id,
             project_id=project.id,
             created_by=UUID(user_id) if user_id is str else user_id,
             file_name=file_name,
             file_path_raw=supa_path,
-            file_size=wav_file.stat().st_size,
-            duration=duration_ms,
-            format='wav',
-            transcription_status=ProcessingStatus.pending,
+            file_path_cleaned=cleaned_path,
+            file_size=file_path.stat().st_size,
+            duration=info.duration_ms,
+            sample_rate=info.sample_rate,
+            channels=info.channels,
+            codec=info.codec,
+            content_hash=content_hash,
+            format=file_path.suffix.removeprefix('.').lower(),
+            transcription_status=(
+                ProcessingStatus.completed
+                if transcription
+                else ProcessingStatus.pending
+            ),
+            transcription_content=(
+                transcription.transcription if transcription else None
+            ),
+            transcription_model=(
+                transcription.model_used if transcription else None
+            ),
             created_at=now,
             updated_at=now,
         )
-        with wav_file.open('rb') as f:
-            await SSSRepo.create_instance().upload(f, file_path=supa_path)
-        project.files.append(audio_file)
-        if project.status == ProcessingStatus.completed:
+        sss = SSSRepo.instance
+        with file_path.open('rb') as f:
+            await sss.upload(
+                f,
+                file_path=supa_path,
+                content_type=audio_content_type(file_path),
+            )
+        if cleaned_path != supa_path:
+            with cleaned_file.open('rb') as f:
+                await sss.upload(f, file_path=cleaned_path)
+        if project.status == ProcessingStatus.completed and not transcription:
             project.status = ProcessingStatus.pending
 
     return project, audio_file
@@ -67,14 +104,10 @@ async def generate_file_name(
     project_id: UUID | str,
     name_with_ext: str,
 ) -> str:
-    path_raw = f'{project_id}/raw/{name_with_ext}'
-    if not await SSSRepo.create_instance().exists(path_raw):
-        return name_with_ext
-    i = 1
-    *names, ext = name_with_ext.split('.')
-    while True:
-        name = bump_name(names[-1], i)
-        path_raw = f'{project_id}/raw/{name}.{ext}'
-        if not await SSSRepo.create_instance().exists(path_raw):
-            return f'{name}.{ext}'
-        i += 1
+    path = Path(name_with_ext)
+    stem = path.stem
+    name = name_with_ext
+    while await SSSRepo.instance.exists(f'{project_id}/raw/{name}'):
+        stem = bump_name(stem)
+        name = f'{stem}{path.suffix}'
+    return name
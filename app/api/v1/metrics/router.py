@@ -0,0 +1,28 @@
+import fastapi as api
+
+from app.core.database import Database
+from app.core.deps.auth import auth_user
+from app.entities.repositories.stt.adaptive import AdaptiveSTTRepo
+from app.entities.repositories.stt.base import STTRepo
+from app.entities.schemas.auth_user import AuthUser
+from app.shared.services.asr_scheduler import ASRScheduler
+from app.shared.services.file_urls import FileURLs
+from app.shared.services.transcription_cache import TranscriptionCache
+
+router = api.APIRouter(prefix='/metrics')
+
+
+@router.get('')
+async def metrics(
+    user: AuthUser = api.Depends(auth_user),
+):
+    stt = STTRepo.instance
+    return {
+        'asr_scheduler': ASRScheduler.stats(),
+        'asr_limiter': (
+            stt.limiter.stats() if isinstance(stt, AdaptiveSTTRepo) else None
+        ),
+        'transcription_cache': TranscriptionCache.stats(),
+        'file_urls': FileURLs.stats(),
+        'db_pool': Database.stats(),
+    }
@@ -3,7 +3,7 @@ from typing import Annotated
 from uuid import UUID
 
 import fastapi as api
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps.auth import auth_user, auth_user_sse
 from app.core.deps.db import get_db
@@ -22,6 +22,7 @@ from app.entities.types.enums.sorting import ProjectSorting
 from app.entities.types.pagination import Paginated
 from app.shared.services.event_manager import EventManager
 from app.shared.services.metadata_exporter import get_exporter
+from app.shared.services.metadata_exporter.artifacts import ExportArtifacts
 from app.shared.services.project_processor import ProjectProcessor
 
 from .services import NewProjectService
@@ -82,7 +83,7 @@ async def new_project(
 
     except Exception as exc:
         logger.error(f"Project creation failed: {exc.args[0]}", exc_info=True)
-        service.close()
+        await service.close()
         raise
 
 
@@ -94,8 +95,10 @@ async def get_all(
     status: ProcessingStatus | None = api.Query(None),
     sort: ProjectSorting = api.Query(ProjectSorting.updated_at),
     order: Ordering = api.Query(Ordering.desc),
+    cursor: str | None = api.Query(None),
+    total: bool | None = api.Query(None),
     user: AuthUser = api.Depends(auth_user),
-    db: Session = api.Depends(get_db),
+    db: AsyncSession = api.Depends(get_db),
 ) -> Paginated[Project]:
     logger.info("Fetch project list")
     logger.debug(
@@ -108,6 +111,8 @@ async def get_all(
         ProjectListingParams(
             page=page,
             limit=limit,
+            cursor=cursor,
+            with_total=total,
             project_name=name,
             status=status,
             sort=sort,
@@ -124,7 +129,7 @@ async def get_all(
 async def get_project(
     project_id: UUID,
     user: AuthUser = api.Depends(auth_user),
-    db: Session = api.Depends(get_db),
+    db: AsyncSession = api.Depends(get_db),
 ):
     logger.info(f"Fetching project {project_id}")
     project = await ProjectRepo.instance.get_project_by_id(db, str(project_id), user.id)
@@ -142,7 +147,7 @@ async def patch(
     project_id: UUID,
     body: UpdateProjectSchema,
     user: AuthUser = api.Depends(auth_user),
-    db: Session = api.Depends(get_db),
+    db: AsyncSession = api.Depends(get_db),
 ):
     logger.info(f"Updating project {project_id}")
     logger.debug(f"Payload: {body.model_dump()}")
@@ -164,7 +169,7 @@ async def patch(
 async def delete(
     project_id: UUID,
     user: AuthUser = api.Depends(auth_user),
-    db: Session = api.Depends(get_db),
+    db: AsyncSession = api.Depends(get_db),
 ):
     logger.info(f"Deleting project {project_id}")
 
@@ -188,7 +193,7 @@ async def delete(
 async def process_project(
     project_id: UUID,
     user: AuthUser = api.Depends(auth_user),
-    db: Session = api.Depends(get_db),
+    db: AsyncSession = api.Depends(get_db),
 ):
     logger.info(f"Process trigger requested for project {project_id}")
 
@@ -205,7 +210,7 @@ async def process_project(
     if project.num_of_files < 1:
         raise api.HTTPException(api.status.HTTP_403_FORBIDDEN, "Project is empty")
 
-    ProjectProcessor.start(project)
+    await ProjectProcessor.start(project)
 
     return {"detail": "Project started processing"}
 
@@ -214,7 +219,7 @@ async def process_project(
 async def get_processing_project(
     project_id: UUID,
     user: AuthUser = api.Depends(auth_user),
-    db: Session = api.Depends(get_db),
+    db: AsyncSession = api.Depends(get_db),
 ) -> api.responses.StreamingResponse:
     logger.info(f"Process trigger requested for project {project_id}")
 
@@ -229,7 +234,7 @@ async def get_processing_project(
             api.status.HTTP_403_FORBIDDEN, "Project has not started"
         )
 
-    update_stream = ProjectProcessor.get_stream(project_id)
+    update_stream = await ProjectProcessor.get_stream(db, project_id)
 
     return api.responses.StreamingResponse(
         update_stream(), media_type="text/event-stream"
@@ -240,13 +245,9 @@ async def get_processing_project(
 async def project_events(
     project_id: UUID,
     user: AuthUser = api.Depends(auth_user),
-    db: Session = api.Depends(get_db),
+    db: AsyncSession = api.Depends(get_db),
 ) -> api.responses.StreamingResponse:
-    _ = ProjectRepo.instance.get_project_or_404(
-        db,
-        project_id,
-        user.id,
-    )
+    await ProjectRepo.instance.get_project_or_404(db, project_id, user.id)
     project_id_str = str(project_id)
     gen = EventManager.get_stream(
         ProjectEvent,
@@ -264,12 +265,12 @@ async def download_project(
     toolkit: Annotated[str, "Values like `Wav2Vec2`, `OpenAI Whisper`"],
     format: Annotated[str, "Values like `csv`, `tsv` or `json`"],
     user: AuthUser = api.Depends(auth_user),
-    db: Session = api.Depends(get_db),
+    db: AsyncSession = api.Depends(get_db),
 ):
     logger.info(f"Download requested for project {project_id}")
 
     project = await ProjectRepo.instance.get_project_or_404(
-        db, str(project_id), user.id
+        db, str(project_id), user.id, with_files=True
     )
 
     if project.status != ProcessingStatus.completed:
@@ -285,10 +286,12 @@ async def download_project(
             api.status.HTTP_422_UNPROCESSABLE_CONTENT, "Invalid export format"
         )
 
-    buffer = await exporter.export(project)
+    # The rows are loaded, don't keep a pooled connection for the whole stream
+    await db.close()
+    chunks = await ExportArtifacts.open(project, format, toolkit, exporter)
 
     return api.responses.StreamingResponse(
-        buffer,
+        chunks,
         media_type="application/zip",
         headers={"Content-Disposition": f'attachment; filename="{project.name}.zip"'},
     )
@@ -1,15 +1,17 @@
+import asyncio
 import datetime
+import shutil
 import time
 import uuid
+from contextlib import suppress
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import cast
-from zipfile import ZipFile
+from typing import NamedTuple, cast
+from zipfile import ZipFile, ZipInfo
 
 import httpx
 from fastapi import HTTPException, UploadFile, status
-from pydub import AudioSegment
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import Config
 from app.core.logger import get as get_logger
@@ -24,11 +26,35 @@ from app.entities.schemas.events.project_event import ProjectEvent
 from app.entities.types.enums.event_type import EventType
 from app.entities.types.enums.processing_status import ProcessingStatus
 from app.shared.services.event_manager import EventManager
-from app.shared.utils.other import convert_to_wav
+from app.shared.services.file_urls import FileURLs
+from app.shared.services.ingest import transcribe_at_ingest
+from app.shared.utils.normalize import normalize_audio
+from app.shared.utils.other import (
+    audio_content_type,
+    hash_file,
+    save_upload,
+    unique_file_name,
+)
+from app.shared.utils.probe import probe
 
 logger = get_logger()
 
 
+class ExtractedAudio(NamedTuple):
+    raw: Path
+    """The file as it was in the archive"""
+    cleaned: Path
+    """Normalized to the ASR profile"""
+    name: str
+    """File name in the project, unique across all archives and folders"""
+
+
+def _extract_member(z: ZipFile, info: ZipInfo, dest: Path) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with z.open(info) as src, dest.open("wb") as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+
+
 class NewProjectService:
     # Params
     files: list[UploadFile]
@@ -40,10 +66,13 @@ class NewProjectService:
     id: uuid.UUID
     now: datetime.datetime
     project: ProjectTable
-    db: Session
+    db: AsyncSession
+    _db_lock: asyncio.Lock
     tmp_folder: TemporaryDirectory
-    files_to_process: list[Path]
+    files_to_process: list[ExtractedAudio]
     processed_files: list[AudioFileTable]
+    _names: set[str]
+    _convert_sem: asyncio.Semaphore
 
     def __init__(
         self,
@@ -62,9 +91,12 @@ class NewProjectService:
         self.id = uuid.uuid4()
         self.now = datetime.datetime.now(datetime.UTC)
         self.db = ProjectRepo.instance.get_session()()
+        self._db_lock = asyncio.Lock()
         self.tmp_folder = TemporaryDirectory()
         self.files_to_process = []
         self.processed_files = []
+        self._names = set()
+        self._convert_sem = asyncio.Semaphore(Config.CONVERT_CONCURRENCY)
         logger.debug(f"Service initialized project_id={self.id}")
 
     def validate_data(self) -> None:
@@ -76,9 +108,9 @@ class NewProjectService:
                 )
         logger.debug("File validation passed")
 
-    def close(self) -> None:
+    async def close(self) -> None:
         logger.debug("Closing DB session and cleaning temp folder")
-        self.db.close()
+        await self.db.close()
         self.tmp_folder.cleanup()
 
     def create_project_instance(self) -> None:
@@ -88,6 +120,7 @@ class NewProjectService:
             description=self.description,
             status=ProcessingStatus.loading,
             progress=0,
+            initial_num_of_files=0,
             project_path=str(self.id),
             created_at=self.now,
             updated_at=self.now,
@@ -103,38 +136,42 @@ class NewProjectService:
         t0 = time.perf_counter()
         logger.info("Extracting zip files")
 
-        for zip_file in self.files:
+        for n, zip_file in enumerate(self.files):
             logger.debug(f"Processing zip: {zip_file.filename}")
             tmp_path = Path(self.tmp_folder.name)
-            zip_path = tmp_path / cast(str, zip_file.filename)
+            # Each archive gets its own root so equal member paths can't clash
+            root = tmp_path / f"zip_{n}"
+            zip_path = tmp_path / Path(cast(str, zip_file.filename)).name
 
-            with zip_path.open("wb") as z:
-                data = await zip_file.read()
-                z.write(data)
-                logger.debug(f"Wrote zip to disk ({len(data):_} bytes) -> {zip_path}")
+            size = await save_upload(zip_file, zip_path, Config.MAX_UPLOAD_BYTES)
+            logger.debug(f"Wrote zip to disk ({size:_} bytes) -> {zip_path}")
 
             with ZipFile(zip_path, "r") as z:
-                z.extractall(self.tmp_folder.name)
-
-                audio_files = [
-                    f
-                    for f in z.namelist()
-                    if f.lower().endswith(Config.SUPPORTED_AUDIO_EXTS)
-                    and not f.startswith("__MACOSX/")
-                    and not f.endswith(".ds_store")
+                audio_members = [
+                    info
+                    for info in z.infolist()
+                    if not info.is_dir()
+                    and info.filename.lower().endswith(Config.SUPPORTED_AUDIO_EXTS)
+                    and not info.filename.startswith("__MACOSX/")
+                    and not info.filename.endswith(".ds_store")
                 ]
 
-                logger.info(f"Found {len(audio_files)} audio candidates in zip")
+                logger.info(f"Found {len(audio_members)} audio candidates in zip")
 
-                for file in audio_files:
-                    try:
-                        source = tmp_path / file
-                        logger.debug(f"Converting to wav: {source.name}")
-                        wav_file = await convert_to_wav(source)
-                        self.files_to_process.append(wav_file)
-                    except Exception:
-                        logger.error(f"Failed to convert {file}", exc_info=True)
-                self.project.initial_num_of_files = len(audio_files)
+                results = await asyncio.gather(
+                    *(
+                        self._extract_and_convert(z, info, root)
+                        for info in audio_members
+                    )
+                )
+                # Members are flattened to their basename, a/x.wav and b/x.wav
+                # must not end up as the same storage object
+                self.files_to_process.extend(
+                    r._replace(name=unique_file_name(r.raw.name, self._names))
+                    for r in results
+                    if r is not None
+                )
+                self.project.initial_num_of_files += len(audio_members)
 
         logger.info(
             f"Extraction completed: {len(self.files_to_process)} files ready ({(time.perf_counter() - t0):.4f}s)"
@@ -145,67 +182,159 @@ class NewProjectService:
             )
         )
 
+    async def _extract_and_convert(
+        self, z: ZipFile, info: ZipInfo, root: Path
+    ) -> ExtractedAudio | None:
+        tmp_path = Path(self.tmp_folder.name)
+        source = (root / info.filename).resolve()
+        if not source.is_relative_to(root.resolve()):
+            logger.warning(f"Skipped zip member outside of the archive root: {info.filename}")
+            return None
+        # a.mp3 and a.wav would share a stem, conversions run concurrently
+        cleaned = tmp_path / ".cleaned" / f"{uuid.uuid4().hex}.wav"
+
+        # Bounded so a large archive can't spawn an ffmpeg per file at once
+        async with self._convert_sem:
+            try:
+                await asyncio.to_thread(_extract_member, z, info, source)
+                logger.debug(f"Normalizing: {source.name}")
+                return ExtractedAudio(
+                    source, await normalize_audio(source, cleaned), source.name
+                )
+            except Exception:
+                logger.error(f"Failed to convert {info.filename}", exc_info=True)
+                return None
+
+    async def _upload_one(
+        self,
+        sss: SSSRepo,
+        sem: asyncio.Semaphore,
+        idx: int,
+        file: ExtractedAudio,
+    ) -> AudioFileTable | None:
+        async with sem:
+            f0 = time.perf_counter()
+            name = file.name
+            logger.debug(f"[{idx}/{len(self.files_to_process)}] Processing {name}")
+
+            supa_path = f"{self.id}/raw/{name}"
+            # Uploads already in the audio profile are stored once
+            cleaned_path = (
+                supa_path if file.cleaned == file.raw
+                else f"{self.id}/cleaned/{name}.wav"
+            )
+
+            uploaded: list[str] = []
+            try:
+                await self._upload_with_retry(sss, file.raw, supa_path)
+                uploaded.append(supa_path)
+                if cleaned_path != supa_path:
+                    await self._upload_with_retry(sss, file.cleaned, cleaned_path)
+                    uploaded.append(cleaned_path)
+
+                info = await probe(file.raw)
+                content_hash = await hash_file(file.cleaned)
+            except (httpx.HTTPError, RuntimeError, OSError, ValueError):
+                # One bad file is skipped, the rest of the project still loads
+                logger.warning(f"Failed to ingest {name}. Skipped", exc_info=True)
+                self.project.initial_num_of_files -= 1
+                if uploaded:
+                    with suppress(httpx.HTTPError):
+                        await sss.bulk_delete(uploaded)
+                return None
+
+            audio_id = uuid.uuid4()
+            transcription = await transcribe_at_ingest(
+                file.cleaned, self.user.id, self.id, content_hash, info.duration_ms
+            )
+
+            audio = AudioFileTable(
+                id=audio_id,
+                project_id=self.id,
+                created_by=self.user.id,
+                file_name=name,
+                file_path_raw=supa_path,
+                file_path_cleaned=cleaned_path,
+                file_size=file.raw.stat().st_size,
+                duration=info.duration_ms,
+                sample_rate=info.sample_rate,
+                channels=info.channels,
+                codec=info.codec,
+                content_hash=content_hash,
+                format=file.raw.suffix.removeprefix(".").lower(),
+                transcription_status=(
+                    ProcessingStatus.completed
+                    if transcription
+                    else ProcessingStatus.pending
+                ),
+                transcription_content=(
+                    transcription.transcription if transcription else None
+                ),
+                transcription_model=(
+                    transcription.model_used if transcription else None
+                ),
+                created_at=self.now,
+                updated_at=self.now,
+            )
+
+            logger.debug(
+                f"Indexed {name} ({info.duration_ms}ms, id={audio_id}) in {(time.perf_counter() - f0):.4f}s"
+            )
+            EventManager.notify(
+                AudioFileEvent.from_table(
+                    audio,
+                    self.user.id + str(self.project.id),
+                    EventType.file_created,
+                    await FileURLs.get(supa_path),
+                )
+            )
+            # Uploads run concurrently but an AsyncSession is not shareable
+            async with self._db_lock:
+                await AudioFileRepo.instance.add_file(self.db, audio)
+            return audio
+
+    @staticmethod
+    async def _upload_with_retry(sss: SSSRepo, file: Path, supa_path: str) -> None:
+        for attempt in range(1, Config.UPLOAD_RETRIES + 1):
+            try:
+                with file.open("rb") as f:
+                    logger.debug(f"Uploading {file.name} -> {supa_path}")
+                    await sss.upload(
+                        f,
+                        file_path=supa_path,
+                        content_type=audio_content_type(file),
+                    )
+                return
+            except httpx.ReadTimeout:
+                if attempt == Config.UPLOAD_RETRIES:
+                    raise
+                delay = Config.UPLOAD_RETRY_BACKOFF * 2 ** (attempt - 1)
+                logger.warning(
+                    f"Upload of {file.name} timed out (attempt {attempt}), retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
     async def upload_files(self) -> None:
         t0 = time.perf_counter()
         logger.info(
             f"Uploading {len(self.files_to_process)} file(s) for project {self.id}"
         )
 
-        sss = SSSRepo.create_instance()
+        sss = SSSRepo.instance
+        sem = asyncio.Semaphore(Config.UPLOAD_CONCURRENCY)
 
         try:
-            for idx, file in enumerate(self.files_to_process, 1):
-                f0 = time.perf_counter()
-                logger.debug(
-                    f"[{idx}/{len(self.files_to_process)}] Processing {file.name}"
-                )
-
-                supa_path = f"{self.id}/raw/{file.name}"
-
-                try:
-                    with file.open("rb") as f:
-                        logger.debug(f"Uploading raw file -> {supa_path}")
-                        await sss.upload(f, file_path=supa_path)
-                except httpx.ReadTimeout:
-                    logger.warning(f"Failed to upload {file.name} to supabase. Skipped")
-                    self.project.initial_num_of_files = (
-                        self.project.initial_num_of_files - 1
-                    )
-                    continue
-
-                audio_segment = AudioSegment.from_file(str(file))
-                duration_ms = len(audio_segment)
-                audio_id = uuid.uuid4()
-
-                audio = AudioFileTable(
-                    id=audio_id,
-                    project_id=self.id,
-                    created_by=self.user.id,
-                    file_name=file.name,
-                    file_path_raw=supa_path,
-                    file_size=file.stat().st_size,
-                    duration=duration_ms,
-                    format=file.suffix.removeprefix("."),
-                    transcription_status=ProcessingStatus.pending,
-                    created_at=self.now,
-                    updated_at=self.now,
-                )
-
-                self.processed_files.append(audio)
-                logger.debug(
-                    f"Indexed {file.name} ({duration_ms}ms, id={audio_id}) in {(time.perf_counter() - f0):.4f}s"
-                )
-                EventManager.notify(
-                    AudioFileEvent.from_table(
-                        audio,
-                        self.user.id + str(self.project.id),
-                        EventType.file_created,
-                        sss.get_public_url(supa_path),
-                    )
-                )
-                await AudioFileRepo.instance.add_file(self.db, audio)
+            # A fatal error cancels the siblings before close() pulls the
+            # session and the temp folder from under them
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(self._upload_one(sss, sem, idx, file))
+                    for idx, file in enumerate(self.files_to_process, 1)
+                ]
+            self.processed_files = [
+                r for task in tasks if (r := task.result()) is not None
+            ]
 
-            self.project.files = self.processed_files
             self.project.status = ProcessingStatus.pending
 
             logger.info("Persisting processed file metadata to DB")
@@ -224,7 +353,26 @@ class NewProjectService:
 
         except Exception:
             logger.error("File processing pipeline failed", exc_info=True)
+            await self._mark_failed()
             raise
 
         finally:
-            self.close()
+            await self.close()
+
+    async def _mark_failed(self) -> None:
+        """Move the project out of `loading` so it doesn't look stuck"""
+        try:
+            await self.db.rollback()
+            self.project.status = ProcessingStatus.error
+            await ProjectRepo.instance.replace_project(
+                self.db, self.project, self.user.id
+            )
+        except Exception:
+            logger.error(f"Could not mark project {self.id} as failed", exc_info=True)
+            return
+
+        EventManager.notify(
+            ProjectEvent.from_table(
+                self.project, self.user.id, EventType.project_updated
+            )
+        )
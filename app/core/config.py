@@ -24,6 +24,36 @@ class Config:
     CHAR_ENCODING = optional_env('CHAR_ENCODING', 'utf-8')
     MAX_TASKS_PER_PROJECT = optional_env('MAX_TASKS_PER_PROJECT', default=4)
     ASR_TIMEOUT = optional_env('ASR_TIMEOUT', default=120.0)
+    ASR_MODEL = optional_env('ASR_MODEL', '')
+    ASR_ON_INGEST = optional_env('ASR_ON_INGEST', default=False)
+    ASR_BATCH_MAX_FILES = optional_env('ASR_BATCH_MAX_FILES', default=1)
+    ASR_BATCH_MAX_DURATION_MS = optional_env('ASR_BATCH_MAX_DURATION_MS', default=60_000)
+    ASR_HTTP2 = optional_env('ASR_HTTP2', default=True)
+    ASR_MAX_CONNECTIONS = optional_env('ASR_MAX_CONNECTIONS', default=32)
+    ASR_MAX_KEEPALIVE_CONNECTIONS = optional_env(
+        'ASR_MAX_KEEPALIVE_CONNECTIONS', default=16
+    )
+    ASR_KEEPALIVE_EXPIRY = optional_env('ASR_KEEPALIVE_EXPIRY', default=60.0)
+    ASR_MAX_IN_FLIGHT = optional_env('ASR_MAX_IN_FLIGHT', default=8)
+    ASR_ADAPTIVE = optional_env('ASR_ADAPTIVE', default=True)
+    ASR_MIN_IN_FLIGHT = optional_env('ASR_MIN_IN_FLIGHT', default=1)
+    ASR_INITIAL_IN_FLIGHT = optional_env('ASR_INITIAL_IN_FLIGHT', default=4)
+    ASR_LATENCY_TOLERANCE = optional_env('ASR_LATENCY_TOLERANCE', default=1.5)
+    EVENT_BUS = cast(
+        Literal['local', 'postgres'],
+        optional_env('EVENT_BUS', 'local').lower(),
+    )
+
+    MAX_UPLOAD_BYTES = optional_env('MAX_UPLOAD_BYTES', default=10 * 1024**3)
+    UPLOAD_CONCURRENCY = optional_env('UPLOAD_CONCURRENCY', default=8)
+    UPLOAD_RETRIES = optional_env('UPLOAD_RETRIES', default=3)
+    UPLOAD_RETRY_BACKOFF = optional_env('UPLOAD_RETRY_BACKOFF', default=1.0)
+    EXPORT_MATERIALIZE = optional_env('EXPORT_MATERIALIZE', default=True)
+    EXPORT_PREFETCH = optional_env('EXPORT_PREFETCH', default=4)
+    EXPORT_PREFETCH_CHUNKS = optional_env('EXPORT_PREFETCH_CHUNKS', default=8)
+    CONVERT_CONCURRENCY = optional_env(
+        'CONVERT_CONCURRENCY', default=os.cpu_count() or 4
+    )
 
     PEM_KEY: bytes
     JWT_SECRET=require_env('JWT_SECRET')
@@ -42,6 +72,65 @@ class Config:
             'SUPABASE_STORAGE_BUCKET_NAME'
         )
 
+    class Database:
+        """One pool shared by every repository, sized for the session pooler"""
+        POOL_SIZE = optional_env('DB_POOL_SIZE', default=20)
+        MAX_OVERFLOW = optional_env('DB_MAX_OVERFLOW', default=10)
+        POOL_TIMEOUT = optional_env('DB_POOL_TIMEOUT', default=30.0)
+        POOL_RECYCLE = optional_env('DB_POOL_RECYCLE', default=3608)
+        POOL_PRE_PING = optional_env('DB_POOL_PRE_PING', default=True)
+
+    class Storage:
+        BACKEND = cast(
+            Literal['supabase', 'local'],
+            optional_env('STORAGE_BACKEND', 'supabase').lower(),
+        )
+        CONCURRENCY = optional_env('STORAGE_CONCURRENCY', default=16)
+        EXPORT_CONCURRENCY = optional_env('STORAGE_EXPORT_CONCURRENCY', default=8)
+        """Downloads feeding export archives, paced by the client so kept apart"""
+        TIMEOUT = optional_env('STORAGE_TIMEOUT', default=120.0)
+        LOCAL_ROOT = optional_env('STORAGE_LOCAL_ROOT', 'storage')
+        LOCAL_PUBLIC_URL = optional_env(
+            'STORAGE_LOCAL_PUBLIC_URL', 'http://localhost:8080/storage'
+        )
+        PUBLIC_URL = optional_env('STORAGE_PUBLIC_URL', '')
+        """Overrides the public object base, e.g. a CDN in front of the bucket"""
+        SIGNED_URLS = optional_env('STORAGE_SIGNED_URLS', default=False)
+        SIGNED_URL_TTL = optional_env('STORAGE_SIGNED_URL_TTL', default=3600)
+        SIGNED_URL_CACHE_SIZE = optional_env('STORAGE_SIGNED_URL_CACHE_SIZE', default=50_000)
+
+    class Jobs:
+        LEASE_SECONDS = optional_env('JOB_LEASE_SECONDS', default=60.0)
+        HEARTBEAT_INTERVAL = optional_env('JOB_HEARTBEAT_INTERVAL', default=15.0)
+        POLL_INTERVAL = optional_env('JOB_POLL_INTERVAL', default=5.0)
+        MAX_ATTEMPTS = optional_env('JOB_MAX_ATTEMPTS', default=5)
+        MAX_CONCURRENT = optional_env('JOB_MAX_CONCURRENT', default=4)
+        RUN_IN_WEB = optional_env('JOB_RUN_IN_WEB', default=True)
+        STATUS_FLUSH_INTERVAL = optional_env('JOB_STATUS_FLUSH_INTERVAL', default=1.0)
+        STATUS_FLUSH_BATCH = optional_env('JOB_STATUS_FLUSH_BATCH', default=500)
+
+    class Audio:
+        """Normalization profile applied to every upload before ASR"""
+        SAMPLE_RATE = optional_env('AUDIO_SAMPLE_RATE', default=16_000)
+        CHANNELS = optional_env('AUDIO_CHANNELS', default=1)
+        CODEC = optional_env('AUDIO_CODEC', 'pcm_s16le')
+        LOUDNORM = optional_env('AUDIO_LOUDNORM', default=False)
+        TRIM_SILENCE = optional_env('AUDIO_TRIM_SILENCE', default=False)
+        """Buffers each decoded file in memory to trim its end, see normalize"""
+        SILENCE_THRESHOLD_DB = optional_env('AUDIO_SILENCE_THRESHOLD_DB', default=-50.0)
+
+    class Segment:
+        """Splitting long recordings at silences before ASR"""
+        ENABLED = optional_env('SEGMENT_ENABLED', default=False)
+        MAX_CHUNK_MS = optional_env('SEGMENT_MAX_CHUNK_MS', default=30_000)
+        MIN_CHUNK_MS = optional_env('SEGMENT_MIN_CHUNK_MS', default=5_000)
+        MIN_SILENCE_MS = optional_env('SEGMENT_MIN_SILENCE_MS', default=300)
+        SILENCE_THRESHOLD_DB = optional_env('SEGMENT_SILENCE_THRESHOLD_DB', default=-35.0)
+
+    class TranscriptionCache:
+        SIZE = optional_env('TRANSCRIPTION_CACHE_SIZE', default=10_000)
+        TTL = optional_env('TRANSCRIPTION_CACHE_TTL', default=7 * 24 * 3600.0)
+
     class Telegram:
         TOKEN = optional_env('TELEGRAM_TOKEN', '')
         CHAT_ID = optional_env('TELEGRAM_CHAT_ID', '')
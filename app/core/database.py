@@ -0,0 +1,56 @@
+from typing import Any
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import Config
+
+
+class Database:
+    """The single engine and connection pool shared by every repository"""
+
+    engine: AsyncEngine | None = None
+    session: async_sessionmaker[AsyncSession]
+
+    @classmethod
+    def init(cls) -> None:
+        if cls.engine is not None:
+            return
+
+        cls.engine = create_async_engine(
+            make_url(Config.Supabase.DATABASE_URL).set(drivername='postgresql+asyncpg'),
+            pool_size=Config.Database.POOL_SIZE,
+            max_overflow=Config.Database.MAX_OVERFLOW,
+            pool_timeout=Config.Database.POOL_TIMEOUT,
+            pool_recycle=Config.Database.POOL_RECYCLE,
+            pool_pre_ping=Config.Database.POOL_PRE_PING,
+        )
+        cls.session = async_sessionmaker(
+            bind=cls.engine, autoflush=False, expire_on_commit=False
+        )
+
+    @classmethod
+    async def close(cls) -> None:
+        if cls.engine is not None:
+            await cls.engine.dispose()
+            cls.engine = None
+
+    @classmethod
+    def stats(cls) -> dict[str, Any] | None:
+        if cls.engine is None or not isinstance(cls.engine.pool, QueuePool):
+            return None
+
+        pool = cls.engine.pool
+        return {
+            'pool_size': pool.size(),
+            'max_overflow': Config.Database.MAX_OVERFLOW,
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            'overflow': pool.overflow(),
+        }
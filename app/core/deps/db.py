@@ -1,8 +1,11 @@
+from collections.abc import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.entities.repositories.project.base import ProjectRepo
 
-def get_db():
+async def get_db() -> AsyncIterator[AsyncSession]:
     SL = ProjectRepo.instance.get_session()
 
-    with SL() as db:
+    async with SL() as db:
         yield db
@@ -3,24 +3,77 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from app.core.config import Config
+from app.core.database import Database
 from app.core.logger import get
 from app.entities.repositories.file.base import AudioFileRepo
 from app.entities.repositories.file.supabase import SupabaseAudioFileRepo
+from app.entities.repositories.job.base import JobRepo
+from app.entities.repositories.job.supabase import SupabaseJobRepo
 from app.entities.repositories.project.base import ProjectRepo
 from app.entities.repositories.project.supabase import SupabaseProjectRepo
 from app.entities.repositories.sss.base import SSSRepo
+from app.entities.repositories.sss.local import LocalSSSRepo
 from app.entities.repositories.sss.supabase import SupabaseSSSRepo
+from app.entities.repositories.stt.adaptive import AdaptiveSTTRepo
 from app.entities.repositories.stt.base import STTRepo
 from app.entities.repositories.stt.external import ExternalSTTRepo
-from app.entities.repositories.stt.mock import MockSTTRepo
+from app.shared.services.adaptive_limiter import AdaptiveLimiter
+from app.shared.services.asr_scheduler import ASRScheduler
+from app.shared.services.event_bus import PostgresEventBus
+from app.shared.services.event_manager import EventManager
+from app.shared.services.metadata_exporter import register_exporters
+from app.shared.services.project_processor import ProjectProcessor
+
+
+def init_repositories() -> None:
+    Database.init()
+    ProjectRepo.init(SupabaseProjectRepo())
+    AudioFileRepo.init(SupabaseAudioFileRepo())
+    SSSRepo.init(
+        LocalSSSRepo() if Config.Storage.BACKEND == 'local' else SupabaseSSSRepo()
+    )
+    STTRepo.init(create_stt_repo())
+    JobRepo.init(SupabaseJobRepo())
+
+
+async def close_repositories() -> None:
+    await STTRepo.instance.close()
+    await SSSRepo.instance.close()
+    await Database.close()
+
+
+def create_stt_repo() -> STTRepo:
+    repo: STTRepo = ExternalSTTRepo()
+    if not Config.ASR_ADAPTIVE:
+        return repo
+
+    # The scheduler follows the adaptive limit so slots stay fairly shared
+    limiter = AdaptiveLimiter(
+        initial=Config.ASR_INITIAL_IN_FLIGHT,
+        min_limit=Config.ASR_MIN_IN_FLIGHT,
+        max_limit=Config.ASR_MAX_IN_FLIGHT,
+        tolerance=Config.ASR_LATENCY_TOLERANCE,
+        on_change=ASRScheduler.set_capacity,
+    )
+    ASRScheduler.set_capacity(limiter.limit)
+    return AdaptiveSTTRepo(repo, limiter)
+
+
+async def init_event_bus(listen: bool) -> None:
+    if Config.EVENT_BUS == 'postgres':
+        await EventManager.use_bus(PostgresEventBus(listen=listen))
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger = get()
-    ProjectRepo.init(SupabaseProjectRepo())
-    AudioFileRepo.init(SupabaseAudioFileRepo())
-    SSSRepo.init(SupabaseSSSRepo)
-    STTRepo.init(ExternalSTTRepo())
+    init_repositories()
+    register_exporters()
+    await init_event_bus(listen=True)
+    if Config.Jobs.RUN_IN_WEB:
+        ProjectProcessor.restart()
     yield
+    await ProjectProcessor.exit()
+    await EventManager.close()
+    await close_repositories()
     logger.warning('Server shut down')
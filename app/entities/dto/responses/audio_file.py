@@ -13,6 +13,9 @@ def audio_file_model_to_schema(file: AudioFileTable, public_url: str | None) ->
         file_size=file.file_size,
         duration=file.duration,
         format=file.format,
+        sample_rate=file.sample_rate,
+        channels=file.channels,
+        codec=file.codec,
         transcription_status=file.transcription_status,
         transcription_content=file.transcription_content,
         error_message=file.error_message,
@@ -1,6 +1,3 @@
-from sqlalchemy.orm import Session
-
-
 from app.entities.dto.responses.audio_file import audio_file_model_to_schema
 from app.entities.models.audio_file import AudioFileTable
 from app.entities.models.project import ProjectTable
@@ -1,5 +1,10 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
-    ...
+    # Columns are timestamptz, asyncpg rejects aware values bound as naive
+    type_annotation_map: dict[Any, Any] = {datetime: DateTime(timezone=True)}
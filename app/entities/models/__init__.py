@@ -1,10 +1,12 @@
 from .auth_user import AuthUserTable
 from .audio_file import AudioFileTable
+from .processing_job import ProcessingJobTable
 from .project import ProjectTable
 
 
 __all__ = [
     'AuthUserTable',
     'AudioFileTable',
+    'ProcessingJobTable',
     'ProjectTable',
 ]
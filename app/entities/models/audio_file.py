@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 from datetime import datetime
 import uuid
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -17,6 +17,25 @@ if TYPE_CHECKING:
 
 class AudioFileTable(Base):
     __tablename__ = 'audio_files'
+    __table_args__ = (
+        # (project_id, <sort column>, id) follows the keyset order of listings
+        Index('audio_files_project_file_name_idx', 'project_id', 'file_name', 'id'),
+        Index(
+            'audio_files_project_status_idx',
+            'project_id', 'transcription_status', 'id',
+        ),
+        Index('audio_files_project_created_at_idx', 'project_id', 'created_at', 'id'),
+        Index('audio_files_project_updated_at_idx', 'project_id', 'updated_at', 'id'),
+        Index('audio_files_project_file_size_idx', 'project_id', 'file_size', 'id'),
+        Index('audio_files_project_duration_idx', 'project_id', 'duration', 'id'),
+        Index('audio_files_project_format_idx', 'project_id', 'format', 'id'),
+        # Transcriptions reused across identical audio, see TranscriptionCache
+        Index(
+            'audio_files_content_hash_model_idx',
+            'content_hash', 'transcription_model',
+            postgresql_where=text("transcription_status = 'completed'"),
+        ),
+    )
 
     # Columns
     id: Mapped[uuid.UUID] = mapped_column(
@@ -34,10 +53,16 @@ class AudioFileTable(Base):
     file_size: Mapped[int | None]
     duration: Mapped[int | None]
     format: Mapped[str | None]
+    sample_rate: Mapped[int | None]
+    channels: Mapped[int | None]
+    codec: Mapped[str | None]
+    """ffmpeg codec name, e.g. pcm_s16le"""
     transcription_status: Mapped[ProcessingStatus] = mapped_column(
         nullable=False, default=ProcessingStatus.pending
     )
     transcription_content: Mapped[str | None]
+    transcription_model: Mapped[str | None]
+    """ASR model behind transcription_content, None when written by hand"""
     error_message: Mapped[str | None]
     processing_started_at: Mapped[datetime | None]
     created_at: Mapped[datetime] = mapped_column(nullable=False)
@@ -51,6 +76,8 @@ class AudioFileTable(Base):
         nullable=False,
     )
     file_path_cleaned: Mapped[str | None]
+    content_hash: Mapped[str | None]
+    """SHA-256 of the normalized audio"""
 
     # Relationships
     project: Mapped['ProjectTable'] = relationship(
@@ -63,3 +90,18 @@ class AudioFileTable(Base):
         uselist=False,
         back_populates='files',
     )
+
+    # Properties
+    @property
+    def audio_path(self) -> str:
+        """Normalized audio when available, the upload as-is otherwise"""
+        return self.file_path_cleaned or self.file_path_raw
+
+
+# Backs the `lower(file_name) like '%...%'` search, needs pg_trgm
+Index(
+    'audio_files_file_name_trgm_idx',
+    func.lower(AudioFileTable.file_name).label('file_name_lower'),
+    postgresql_using='gin',
+    postgresql_ops={'file_name_lower': 'gin_trgm_ops'},
+)
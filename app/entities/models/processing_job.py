@@ -0,0 +1,55 @@
+import uuid
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.entities.types.enums.job_status import JobStatus
+
+from .__base__ import Base
+
+if TYPE_CHECKING:
+    from .project import ProjectTable
+
+
+class ProcessingJobTable(Base):
+    __tablename__ = "processing_jobs"
+
+    # Columns
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    project_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    created_by: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey(
+            "auth.users.id",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+    )
+    status: Mapped[JobStatus] = mapped_column(
+        nullable=False,
+        default=JobStatus.queued,
+    )
+    lease_owner: Mapped[str | None]
+    lease_expires_at: Mapped[datetime | None]
+    heartbeat_at: Mapped[datetime | None]
+    attempts: Mapped[int] = mapped_column(nullable=False, default=0)
+    last_error: Mapped[str | None]
+    created_at: Mapped[datetime] = mapped_column(nullable=False, default=lambda: datetime.now(UTC))
+    updated_at: Mapped[datetime] = mapped_column(nullable=False, default=lambda: datetime.now(UTC))
+
+    # Relationships
+    project: Mapped["ProjectTable"] = relationship(
+        "ProjectTable",
+        uselist=False,
+    )
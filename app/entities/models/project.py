@@ -1,11 +1,10 @@
 import uuid
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, func, select
+from sqlalchemy import ForeignKey, Index, case, func, select
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import Mapped, mapped_column, object_session, relationship
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from app.entities.types.enums.processing_status import ProcessingStatus
 
@@ -18,6 +17,14 @@ if TYPE_CHECKING:
 
 class ProjectTable(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # (created_by, <sort column>, id) follows the keyset order of listings
+        Index("projects_created_by_name_idx", "created_by", "name", "id"),
+        Index("projects_created_by_status_idx", "created_by", "status", "id"),
+        Index("projects_created_by_progress_idx", "created_by", "progress", "id"),
+        Index("projects_created_by_created_at_idx", "created_by", "created_at", "id"),
+        Index("projects_created_by_updated_at_idx", "created_by", "updated_at", "id"),
+    )
 
     # Columns
     id: Mapped[uuid.UUID] = mapped_column(
@@ -34,8 +41,10 @@ class ProjectTable(Base):
     progress: Mapped[float] = mapped_column(nullable=False, default=0.0)
     project_path: Mapped[str] = mapped_column(nullable=False)
     initial_num_of_files: Mapped[int] = mapped_column(nullable=False, default=0)
-    created_at: Mapped[datetime] = mapped_column(nullable=False, default=datetime.now)
-    updated_at: Mapped[datetime] = mapped_column(nullable=False, default=datetime.now)
+    content_version: Mapped[int] = mapped_column(nullable=False, default=0)
+    """Bumped whenever files or transcriptions change, keys export artifacts"""
+    created_at: Mapped[datetime] = mapped_column(nullable=False, default=lambda: datetime.now(UTC))
+    updated_at: Mapped[datetime] = mapped_column(nullable=False, default=lambda: datetime.now(UTC))
     created_by: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey(
@@ -61,20 +70,22 @@ class ProjectTable(Base):
     )
 
     # Properties
-    @hybrid_property
-    def num_of_files(self) -> int:
-        if self.status == ProcessingStatus.loading:
-            return self.initial_num_of_files
+    num_of_files: Mapped[int] = column_property(
+        case(
+            (status == ProcessingStatus.loading, initial_num_of_files),
+            else_=select(func.count(AudioFileTable.id))
+            .where(AudioFileTable.project_id == id)
+            .correlate_except(AudioFileTable)
+            .scalar_subquery(),
+        )
+    )
+    """Files counted in the same SELECT, the upload estimate while loading"""
 
-        session = object_session(self)
-        if session is None:
-            return self.initial_num_of_files
 
-        return (
-            session.scalar(
-                select(func.count(AudioFileTable.id)).where(
-                    AudioFileTable.project_id == self.id
-                )
-            )
-            or 0
-        )
+# Backs the `lower(name) like '%...%'` search, needs pg_trgm
+Index(
+    "projects_name_trgm_idx",
+    func.lower(ProjectTable.name).label("name_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"name_lower": "gin_trgm_ops"},
+)
@@ -5,7 +5,7 @@ from uuid import UUID
 from collections.abc import Callable
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.entities.models.audio_file import AudioFileTable
 from app.entities.schemas.params.listing.audio_file import AudioFileListingParams
@@ -22,13 +22,13 @@ class AudioFileRepo(ABC):
         cls.instance = repo
 
     @abstractmethod
-    def get_session(self) -> sessionmaker[Session]:
+    def get_session(self) -> async_sessionmaker[AsyncSession]:
         ...
 
     @abstractmethod
     async def get_files_for_project[T](
         self,
-        db: Session,
+        db: AsyncSession,
         project_id: UUID | str,
         user_id: UUID | str,
         params: AudioFileListingParams,
@@ -40,7 +40,7 @@ class AudioFileRepo(ABC):
     @abstractmethod
     async def get_file_by_id(
         self,
-        db: Session,
+        db: AsyncSession,
         file_id: UUID | str,
         user_id: UUID | str,
     ) -> AudioFileTable | None:
@@ -48,7 +48,7 @@ class AudioFileRepo(ABC):
 
     async def get_project_or_404(
         self,
-        db: Session,
+        db: AsyncSession,
         file_id: UUID | str,
         user_id: UUID | str,
     ) -> AudioFileTable:
@@ -67,17 +67,17 @@ class AudioFileRepo(ABC):
         return file
 
     @abstractmethod
-    async def create_file(self, db: Session, project_id: UUID | str, user_id: UUID | str, **kwargs) -> AudioFileTable:
+    async def create_file(self, db: AsyncSession, project_id: UUID | str, user_id: UUID | str, **kwargs) -> AudioFileTable:
         ...
 
     @abstractmethod
-    async def add_file(self, db: Session, file: AudioFileTable) -> None:
+    async def add_file(self, db: AsyncSession, file: AudioFileTable) -> None:
         ...
 
     @abstractmethod
     async def update_file(
         self,
-        db: Session,
+        db: AsyncSession,
         file_id: UUID | str,
         user_id: UUID | str,
         data: UpdateAudioFileSchema,
@@ -87,17 +87,34 @@ class AudioFileRepo(ABC):
     @abstractmethod
     async def replace_file(
         self,
-        db: Session,
+        db: AsyncSession,
         file: AudioFileTable,
         user_id: UUID | str,
         exists_only: bool = False,
     ) -> AudioFileTable:
         ...
 
+    @abstractmethod
+    async def save_transcriptions(
+        self, db: AsyncSession, files: list[AudioFileTable]
+    ) -> None:
+        """Write the files' transcription fields in one executemany UPDATE"""
+        ...
+
+    @abstractmethod
+    async def find_transcription(
+        self,
+        db: AsyncSession,
+        content_hash: str,
+        model: str,
+    ) -> AudioFileTable | None:
+        """Any completed file with this audio, transcribed by `model`"""
+        ...
+
     @abstractmethod
     async def delete_file(
         self,
-        db: Session,
+        db: AsyncSession,
         file_id: UUID | str,
         user_id: UUID | str,
     ) -> bool:
@@ -106,7 +123,7 @@ class AudioFileRepo(ABC):
     @abstractmethod
     async def get_completed_files(
         self,
-        db: Session,
+        db: AsyncSession,
         project_id: UUID | str,
     ) -> list[AudioFileTable]:
         ...
@@ -4,15 +4,16 @@ from typing import override
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import create_engine, func
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.config import Config
+from app.core.database import Database
 from app.core.logger import get
 from app.entities.models.audio_file import AudioFileTable
 from app.entities.models.project import ProjectTable
 from app.entities.schemas.params.listing.audio_file import AudioFileListingParams
 from app.entities.schemas.requests.audio_file import UpdateAudioFileSchema
+from app.entities.types.enums.processing_status import ProcessingStatus
 from app.entities.types.pagination import Paginated
 from app.shared.utils.query import paginate_query
 
@@ -21,34 +22,35 @@ from .base import AudioFileRepo
 logger = get()
 
 
-class SupabaseAudioFileRepo(AudioFileRepo):
-    def __init__(self) -> None:
-        self.engine = create_engine(Config.Supabase.DATABASE_URL)
-        self.SessionLocal = sessionmaker(
-            bind=self.engine, autoflush=False, autocommit=False, expire_on_commit=False
-        )
+async def bump_content_version(db: AsyncSession, project_id: UUID | str) -> None:
+    """Mark the project's exports stale, applied with the caller's commit"""
+    await db.execute(
+        update(ProjectTable)
+        .where(ProjectTable.id == project_id)
+        .values(content_version=ProjectTable.content_version + 1)
+        .execution_options(synchronize_session=False)
+    )
 
-        super().__init__()
 
+class SupabaseAudioFileRepo(AudioFileRepo):
     @override
-    def get_session(self) -> sessionmaker[Session]:
-        return self.SessionLocal
+    def get_session(self) -> async_sessionmaker[AsyncSession]:
+        return Database.session
 
     @override
     async def get_files_for_project[T](
         self,
-        db: Session,
+        db: AsyncSession,
         project_id: UUID | str,
         user_id: UUID | str,
         params: AudioFileListingParams,
         *,
         mapper: Callable[[AudioFileTable], T] = lambda x: x,
     ) -> Paginated[T]:
-        project = (
-            db.query(ProjectTable)
-            .filter(ProjectTable.created_by == user_id)
-            .filter(ProjectTable.id == project_id)
-            .one_or_none()
+        project = await db.scalar(
+            select(ProjectTable.id)
+            .where(ProjectTable.created_by == user_id)
+            .where(ProjectTable.id == project_id)
         )
 
         if project is None:
@@ -64,38 +66,45 @@ class SupabaseAudioFileRepo(AudioFileRepo):
         sort = params.sort
         order = params.order
 
-        query = db.query(AudioFileTable).filter(AudioFileTable.project_id == project_id)
+        query = select(AudioFileTable).where(AudioFileTable.project_id == project_id)
 
         if len(name) > 2:
-            query = query.filter(
+            query = query.where(
                 func.lower(AudioFileTable.file_name).like(f"%{name.lower()}%")
             )
 
         if f_status is not None:
-            query = query.filter(AudioFileTable.transcription_status == f_status)
-
-        sort_col = sort.column()
-        query = order.apply(query, sort_col)
+            query = query.where(AudioFileTable.transcription_status == f_status)
 
-        return paginate_query(db, query, limit, page, mapper=mapper)
+        return await paginate_query(
+            db,
+            query,
+            sort.column(),
+            order,
+            AudioFileTable.id,
+            limit=limit,
+            page=page,
+            cursor=params.cursor,
+            with_total=params.with_total,
+            mapper=mapper,
+        )
 
     @override
     async def get_file_by_id(
         self,
-        db: Session,
+        db: AsyncSession,
         file_id: UUID | str,
         user_id: UUID | str,
     ) -> AudioFileTable | None:
-        return (
-            db.query(AudioFileTable)
-            .filter(AudioFileTable.id == file_id)
-            .filter(AudioFileTable.created_by == user_id)
-            .one_or_none()
+        return await db.scalar(
+            select(AudioFileTable)
+            .where(AudioFileTable.id == file_id)
+            .where(AudioFileTable.created_by == user_id)
         )
 
     async def get_file_or_404(
         self,
-        db: Session,
+        db: AsyncSession,
         file_id: UUID | str,
         user_id: UUID | str,
     ) -> AudioFileTable:
@@ -115,48 +124,50 @@ class SupabaseAudioFileRepo(AudioFileRepo):
 
     @override
     async def create_file(
-        self, db: Session, project_id: UUID | str, user_id: UUID | str, **kwargs
+        self, db: AsyncSession, project_id: UUID | str, user_id: UUID | str, **kwargs
     ) -> AudioFileTable:
         file = AudioFileTable(project_id=project_id, created_by=user_id, **kwargs)
         db.add(file)
-        db.commit()
-        db.refresh(file)
+        await db.commit()
+        await db.refresh(file)
         return file
 
     @override
-    async def add_file(self, db: Session, file: AudioFileTable) -> None:
+    async def add_file(self, db: AsyncSession, file: AudioFileTable) -> None:
         db.add(file)
-        db.commit()
-        db.refresh(file)
+        await db.commit()
+        await db.refresh(file)
 
     @override
     async def update_file(
         self,
-        db: Session,
+        db: AsyncSession,
         file_id: UUID | str,
         user_id: UUID | str,
         data: UpdateAudioFileSchema,
     ) -> AudioFileTable | None:
         file = await self.get_file_or_404(db, file_id, user_id)
 
-        data.update(file)
+        if data.update(file):
+            await bump_content_version(db, file.project_id)
 
-        name_query = (
-            db.query(AudioFileTable)
-            .filter(AudioFileTable.project_id == file.project_id)
-            .filter(AudioFileTable.id != file.id)
+        name_taken = await db.scalar(
+            select(AudioFileTable.id)
+            .where(AudioFileTable.project_id == file.project_id)
+            .where(AudioFileTable.id != file.id)
             .where(AudioFileTable.file_name == file.file_name)
+            .limit(1)
         )
-        if name_query.first():
+        if name_taken is not None:
             raise HTTPException(status.HTTP_400_BAD_REQUEST, "Name already exists")
-        db.commit()
-        db.refresh(file)
+        await db.commit()
+        await db.refresh(file)
         return file
 
     @override
     async def replace_file(
         self,
-        db: Session,
+        db: AsyncSession,
         file: AudioFileTable,
         user_id: UUID | str,
         exists_only: bool = False,
@@ -171,21 +182,65 @@ class SupabaseAudioFileRepo(AudioFileRepo):
                 )
             file.updated_at = datetime.now(UTC)
             db.add(file)
-            db.commit()
-            db.refresh(file)
+            await db.commit()
+            await db.refresh(file)
             return file
 
-        for column in ProjectTable.__table__.columns.keys():
+        for column in AudioFileTable.__table__.columns.keys():
             setattr(existing, column, getattr(file, column))
         existing.updated_at = datetime.now(UTC)
-        db.commit()
-        db.refresh(existing)
+        await db.commit()
+        await db.refresh(existing)
         return existing
 
+    @override
+    async def save_transcriptions(
+        self, db: AsyncSession, files: list[AudioFileTable]
+    ) -> None:
+        if not files:
+            return
+
+        # Keeps the updated_at listing order and cursors in step with processing
+        now = datetime.now(UTC)
+        for file in files:
+            file.updated_at = now
+
+        # ORM bulk UPDATE by primary key, sent as a single executemany
+        await db.execute(
+            update(AudioFileTable),
+            [
+                {
+                    "id": file.id,
+                    "transcription_status": file.transcription_status,
+                    "transcription_content": file.transcription_content,
+                    "transcription_model": file.transcription_model,
+                    "error_message": file.error_message,
+                    "updated_at": file.updated_at,
+                }
+                for file in files
+            ],
+        )
+        await db.commit()
+
+    @override
+    async def find_transcription(
+        self,
+        db: AsyncSession,
+        content_hash: str,
+        model: str,
+    ) -> AudioFileTable | None:
+        return await db.scalar(
+            select(AudioFileTable)
+            .where(AudioFileTable.content_hash == content_hash)
+            .where(AudioFileTable.transcription_model == model)
+            .where(AudioFileTable.transcription_status == ProcessingStatus.completed)
+            .limit(1)
+        )
+
     @override
     async def delete_file(
         self,
-        db: Session,
+        db: AsyncSession,
         file_id: UUID | str,
         user_id: UUID | str,
     ) -> bool:
@@ -194,23 +249,21 @@ class SupabaseAudioFileRepo(AudioFileRepo):
         if file is None:
             return False
 
-        db.delete(file)
-        db.commit()
+        await db.delete(file)
+        await bump_content_version(db, file.project_id)
+        await db.commit()
         logger.info(f"Deleted file {file.id} from project {file.project_id}")
         return True
 
     @override
     async def get_completed_files(
         self,
-        db: Session,
+        db: AsyncSession,
         project_id: UUID | str,
     ) -> list[AudioFileTable]:
-        from app.entities.types.enums.processing_status import ProcessingStatus
-        
-        files = (
-            db.query(AudioFileTable)
-            .filter(AudioFileTable.project_id == project_id)
-            .filter(AudioFileTable.transcription_status == ProcessingStatus.completed)
-            .all()
+        files = await db.scalars(
+            select(AudioFileTable)
+            .where(AudioFileTable.project_id == project_id)
+            .where(AudioFileTable.transcription_status == ProcessingStatus.completed)
         )
-        return files
+        return list(files)
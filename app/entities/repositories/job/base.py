@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.entities.models.processing_job import ProcessingJobTable
+from app.entities.models.project import ProjectTable
+
+
+class JobRepo(ABC):
+    """Persistent processing queue leased by workers"""
+
+    instance: JobRepo
+
+    @classmethod
+    def init(cls, repo: JobRepo) -> None:
+        cls.instance = repo
+
+    @abstractmethod
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        project: ProjectTable,
+    ) -> ProcessingJobTable:
+        ...
+
+    @abstractmethod
+    async def get_active_job(
+        self,
+        db: AsyncSession,
+        project_id: UUID | str,
+    ) -> ProcessingJobTable | None:
+        ...
+
+    @abstractmethod
+    async def lease_next(
+        self,
+        db: AsyncSession,
+        worker_id: str,
+        lease_seconds: float,
+        project_id: UUID | str | None = None,
+    ) -> ProcessingJobTable | None:
+        ...
+
+    @abstractmethod
+    async def heartbeat(
+        self,
+        db: AsyncSession,
+        job_id: UUID | str,
+        worker_id: str,
+        lease_seconds: float,
+    ) -> bool:
+        ...
+
+    @abstractmethod
+    async def complete(
+        self,
+        db: AsyncSession,
+        job_id: UUID | str,
+        worker_id: str,
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def fail(
+        self,
+        db: AsyncSession,
+        job_id: UUID | str,
+        worker_id: str,
+        error: str,
+        max_attempts: int,
+    ) -> ProjectTable | None:
+        """Re-queue the job, or give up on it after `max_attempts`.
+
+        Giving up also marks the project as errored in the same transaction,
+        the updated project is returned so the caller can announce it.
+        """
+        ...
+
+    @abstractmethod
+    async def release(
+        self,
+        db: AsyncSession,
+        worker_id: str,
+    ) -> int:
+        ...
+
+    @abstractmethod
+    async def requeue_expired(
+        self,
+        db: AsyncSession,
+        max_attempts: int,
+    ) -> list[ProjectTable]:
+        """Re-queue jobs whose lease ran out, failing them like `fail` does.
+
+        Returns the projects marked as errored.
+        """
+        ...
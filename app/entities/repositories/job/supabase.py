@@ -0,0 +1,261 @@
+from datetime import UTC, datetime, timedelta
+from typing import override
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logger import get
+from app.entities.models.processing_job import ProcessingJobTable
+from app.entities.models.project import ProjectTable
+from app.entities.types.enums.job_status import JobStatus
+from app.entities.types.enums.processing_status import ProcessingStatus
+
+from .base import JobRepo
+
+logger = get()
+
+_ACTIVE = (JobStatus.queued, JobStatus.leased)
+
+
+class SupabaseJobRepo(JobRepo):
+
+    @override
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        project: ProjectTable,
+    ) -> ProcessingJobTable:
+        existing = await self.get_active_job(db, project.id)
+        if existing is not None:
+            return existing
+
+        now = datetime.now(UTC)
+        job = ProcessingJobTable(
+            project_id=project.id,
+            created_by=project.created_by,
+            status=JobStatus.queued,
+            attempts=0,
+            created_at=now,
+            updated_at=now,
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+    @override
+    async def get_active_job(
+        self,
+        db: AsyncSession,
+        project_id: UUID | str,
+    ) -> ProcessingJobTable | None:
+        return await db.scalar(
+            select(ProcessingJobTable)
+            .where(ProcessingJobTable.project_id == project_id)
+            .where(ProcessingJobTable.status.in_(_ACTIVE))
+            .limit(1)
+        )
+
+    @override
+    async def lease_next(
+        self,
+        db: AsyncSession,
+        worker_id: str,
+        lease_seconds: float,
+        project_id: UUID | str | None = None,
+    ) -> ProcessingJobTable | None:
+        query = select(ProcessingJobTable).where(
+            ProcessingJobTable.status == JobStatus.queued
+        )
+        if project_id is not None:
+            query = query.where(ProcessingJobTable.project_id == project_id)
+
+        job = await db.scalar(
+            query.order_by(ProcessingJobTable.created_at)
+            .with_for_update(skip_locked=True)
+            .limit(1)
+        )
+
+        if job is None:
+            await db.commit()
+            return None
+
+        job.status = JobStatus.leased
+        job.lease_owner = worker_id
+        job.lease_expires_at = func.now() + timedelta(seconds=lease_seconds)
+        job.heartbeat_at = func.now()
+        job.attempts = job.attempts + 1
+        job.updated_at = datetime.now(UTC)
+        await db.commit()
+        await db.refresh(job)
+        logger.info(f"Leased job {job.id} for project {job.project_id} (attempt {job.attempts})")
+        return job
+
+    @override
+    async def heartbeat(
+        self,
+        db: AsyncSession,
+        job_id: UUID | str,
+        worker_id: str,
+        lease_seconds: float,
+    ) -> bool:
+        result = await db.execute(
+            update(ProcessingJobTable)
+            .where(ProcessingJobTable.id == job_id)
+            .where(ProcessingJobTable.lease_owner == worker_id)
+            .where(ProcessingJobTable.status == JobStatus.leased)
+            .values(
+                lease_expires_at=func.now() + timedelta(seconds=lease_seconds),
+                heartbeat_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount > 0
+
+    @override
+    async def complete(
+        self,
+        db: AsyncSession,
+        job_id: UUID | str,
+        worker_id: str,
+    ) -> None:
+        await db.execute(
+            update(ProcessingJobTable)
+            .where(ProcessingJobTable.id == job_id)
+            .where(ProcessingJobTable.lease_owner == worker_id)
+            .values(
+                status=JobStatus.completed,
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=datetime.now(UTC),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    @override
+    async def fail(
+        self,
+        db: AsyncSession,
+        job_id: UUID | str,
+        worker_id: str,
+        error: str,
+        max_attempts: int,
+    ) -> ProjectTable | None:
+        job = await db.scalar(
+            select(ProcessingJobTable)
+            .where(ProcessingJobTable.id == job_id)
+            .where(ProcessingJobTable.lease_owner == worker_id)
+        )
+        if job is None:
+            await db.commit()
+            return None
+
+        job.status = (
+            JobStatus.failed if job.attempts >= max_attempts else JobStatus.queued
+        )
+        job.lease_owner = None
+        job.lease_expires_at = None
+        job.last_error = error
+        job.updated_at = datetime.now(UTC)
+        failed = [job.project_id] if job.status == JobStatus.failed else []
+        await self._fail_projects(db, failed)
+        await db.commit()
+        logger.warning(f"Job {job.id} failed (attempt {job.attempts}), now {job.status}")
+
+        projects = await self._get_projects(db, failed)
+        return projects[0] if projects else None
+
+    @override
+    async def release(
+        self,
+        db: AsyncSession,
+        worker_id: str,
+    ) -> int:
+        result = await db.execute(
+            update(ProcessingJobTable)
+            .where(ProcessingJobTable.lease_owner == worker_id)
+            .where(ProcessingJobTable.status == JobStatus.leased)
+            .values(
+                status=JobStatus.queued,
+                lease_owner=None,
+                lease_expires_at=None,
+                updated_at=datetime.now(UTC),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount
+
+    @override
+    async def requeue_expired(
+        self,
+        db: AsyncSession,
+        max_attempts: int,
+    ) -> list[ProjectTable]:
+        expired = (
+            update(ProcessingJobTable)
+            .where(ProcessingJobTable.status == JobStatus.leased)
+            .where(ProcessingJobTable.lease_expires_at < func.now())
+            .execution_options(synchronize_session=False)
+        )
+        exhausted = list(
+            await db.scalars(
+                expired.where(ProcessingJobTable.attempts >= max_attempts)
+                .values(
+                    status=JobStatus.failed,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    last_error="Lease expired too many times",
+                    updated_at=datetime.now(UTC),
+                )
+                .returning(ProcessingJobTable.project_id)
+            )
+        )
+        await self._fail_projects(db, exhausted)
+        requeued = (
+            await db.execute(
+                expired.where(ProcessingJobTable.attempts < max_attempts).values(
+                    status=JobStatus.queued,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    updated_at=datetime.now(UTC),
+                )
+            )
+        ).rowcount
+        await db.commit()
+
+        if exhausted:
+            logger.warning(f"Gave up on {len(exhausted)} job(s) with expired leases")
+        if requeued:
+            logger.warning(f"Re-queued {requeued} job(s) with expired leases")
+        return await self._get_projects(db, exhausted)
+
+    @staticmethod
+    async def _fail_projects(db: AsyncSession, project_ids: list[UUID]) -> None:
+        if not project_ids:
+            return
+
+        await db.execute(
+            update(ProjectTable)
+            .where(ProjectTable.id.in_(project_ids))
+            .values(status=ProcessingStatus.error, updated_at=datetime.now(UTC))
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def _get_projects(
+        db: AsyncSession, project_ids: list[UUID]
+    ) -> list[ProjectTable]:
+        if not project_ids:
+            return []
+
+        # Loaded after the bulk UPDATE, refresh anything already in the session
+        projects = await db.scalars(
+            select(ProjectTable)
+            .where(ProjectTable.id.in_(project_ids))
+            .execution_options(populate_existing=True)
+        )
+        return list(projects)
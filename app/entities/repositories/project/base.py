@@ -6,7 +6,7 @@ from collections.abc import Callable, Generator
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.entities.models.project import ProjectTable
 from app.entities.models.audio_file import AudioFileTable
@@ -25,13 +25,13 @@ class ProjectRepo(ABC):
         cls.instance = repo
 
     @abstractmethod
-    def get_session(self) -> sessionmaker[Session]:
+    def get_session(self) -> async_sessionmaker[AsyncSession]:
         ...
 
     @abstractmethod
     async def get_all_projects_for_user[T](
         self,
-        db: Session,
+        db: AsyncSession,
         user_id: UUID | str,
         params: ProjectListingParams,
         *,
@@ -42,22 +42,28 @@ class ProjectRepo(ABC):
     @abstractmethod
     async def get_project_by_id(
         self,
-        db: Session,
+        db: AsyncSession,
         project_id: UUID | str,
         user_id: UUID | str,
+        *,
+        with_files: bool = False,
     ) -> ProjectTable | None:
+        """`with_files` eager-loads `files`, async sessions cannot lazy load"""
         ...
         
     async def get_project_or_404(
         self,
-        db: Session,
+        db: AsyncSession,
         project_id: UUID | str,
         user_id: UUID | str,
+        *,
+        with_files: bool = False,
     ) -> ProjectTable:
         project = await self.get_project_by_id(
             db,
             project_id,
             user_id,
+            with_files=with_files,
         )
 
         if project is None:
@@ -69,17 +75,17 @@ class ProjectRepo(ABC):
         return project
 
     @abstractmethod
-    async def create_project(self, db: Session, user_id: UUID | str, **kwargs) -> ProjectTable:
+    async def create_project(self, db: AsyncSession, user_id: UUID | str, **kwargs) -> ProjectTable:
         ...
 
     @abstractmethod
-    async def add_project(self, db: Session, project: ProjectTable) -> None:
+    async def add_project(self, db: AsyncSession, project: ProjectTable) -> None:
         ...
 
     @abstractmethod
     async def update_project(
         self,
-        db: Session,
+        db: AsyncSession,
         project_id: UUID | str,
         user_id: UUID | str,
         data: UpdateProjectSchema,
@@ -89,17 +95,34 @@ class ProjectRepo(ABC):
     @abstractmethod
     async def replace_project(
         self,
-        db: Session,
+        db: AsyncSession,
         project: ProjectTable,
         user_id: UUID | str,
         exists_only: bool = False,
     ) -> ProjectTable:
         ...
 
+    @abstractmethod
+    async def get_content_version(
+        self,
+        db: AsyncSession,
+        project_id: UUID | str,
+    ) -> int | None:
+        ...
+
+    @abstractmethod
+    async def bump_content_version(
+        self,
+        db: AsyncSession,
+        project_id: UUID | str,
+    ) -> None:
+        """Atomically mark exports stale, applied with the caller's commit"""
+        ...
+
     @abstractmethod
     async def delete_project(
         self,
-        db: Session,
+        db: AsyncSession,
         project_id: UUID | str,
         user_id: UUID | str,
     ) -> bool:
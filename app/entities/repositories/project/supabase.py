@@ -4,11 +4,14 @@ from typing import override
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import create_engine, func
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
 
-from app.core.config import Config
+from app.core.database import Database
+from app.entities.models.audio_file import AudioFileTable
 from app.entities.models.project import ProjectTable
+from app.entities.repositories.file.supabase import bump_content_version
 from app.entities.repositories.sss.base import SSSRepo
 from app.entities.schemas.params.listing.project import ProjectListingParams
 from app.entities.schemas.requests.project import UpdateProjectSchema
@@ -19,28 +22,14 @@ from .base import ProjectRepo
 
 
 class SupabaseProjectRepo(ProjectRepo):
-    def __init__(self) -> None:
-        self.engine = create_engine(
-            Config.Supabase.DATABASE_URL,
-            pool_pre_ping=True,
-            pool_size=20,
-            max_overflow=10,
-            pool_recycle=3608,
-        )
-        self.SessionLocal = sessionmaker(
-            bind=self.engine, autoflush=False, autocommit=False, expire_on_commit=False
-        )
-
-        super().__init__()
-
     @override
-    def get_session(self) -> sessionmaker[Session]:
-        return self.SessionLocal
+    def get_session(self) -> async_sessionmaker[AsyncSession]:
+        return Database.session
 
     @override
     async def get_all_projects_for_user[T](
         self,
-        db: Session,
+        db: AsyncSession,
         user_id: UUID | str,
         params: ProjectListingParams,
         *,
@@ -53,77 +42,88 @@ class SupabaseProjectRepo(ProjectRepo):
         sort = params.sort
         order = params.order
 
-        query = db.query(ProjectTable).filter(ProjectTable.created_by == user_id)
+        query = select(ProjectTable).where(ProjectTable.created_by == user_id)
         if len(name) > 2:
-            query = query.filter(
+            query = query.where(
                 func.lower(ProjectTable.name).like(f"%{name.lower()}%")
             )
 
         if status is not None:
-            query = query.filter(ProjectTable.status == status)
-
-        sort_col = sort.column()
-        query = order.apply(query, sort_col)
-
-        return paginate_query(db, query, limit=limit, page=page, mapper=mapper)
+            query = query.where(ProjectTable.status == status)
+
+        return await paginate_query(
+            db,
+            query,
+            sort.column(),
+            order,
+            ProjectTable.id,
+            limit=limit,
+            page=page,
+            cursor=params.cursor,
+            with_total=params.with_total,
+            mapper=mapper,
+        )
 
     @override
     async def get_project_by_id(
         self,
-        db: Session,
+        db: AsyncSession,
         project_id: UUID | str,
         user_id: UUID | str,
+        *,
+        with_files: bool = False,
     ) -> ProjectTable | None:
-        return (
-            db.query(ProjectTable)
-            .filter(ProjectTable.created_by == user_id)
-            .filter(ProjectTable.id == project_id)
-            .one_or_none()
+        query = (
+            select(ProjectTable)
+            .where(ProjectTable.created_by == user_id)
+            .where(ProjectTable.id == project_id)
         )
+        if with_files:
+            query = query.options(selectinload(ProjectTable.files))
+        return await db.scalar(query)
 
     @override
     async def create_project(
-        self, db: Session, user_id: UUID | str, **kwargs
+        self, db: AsyncSession, user_id: UUID | str, **kwargs
     ) -> ProjectTable:
         project = ProjectTable(created_by=user_id, **kwargs)
         db.add(project)
-        db.commit()
-        db.refresh(project)
+        await db.commit()
+        await db.refresh(project)
         return project
 
     @override
-    async def add_project(self, db: Session, project: ProjectTable) -> None:
+    async def add_project(self, db: AsyncSession, project: ProjectTable) -> None:
         db.add(project)
-        db.commit()
-        db.refresh(project)
+        await db.commit()
+        await db.refresh(project)
 
     @override
     async def update_project(
         self,
-        db: Session,
+        db: AsyncSession,
         project_id: UUID | str,
         user_id: UUID | str,
         data: UpdateProjectSchema,
     ) -> ProjectTable | None:
-        project = (
-            db.query(ProjectTable)
-            .filter(ProjectTable.id == project_id)
-            .filter(ProjectTable.created_by == user_id)
-            .one_or_none()
+        project = await db.scalar(
+            select(ProjectTable)
+            .where(ProjectTable.id == project_id)
+            .where(ProjectTable.created_by == user_id)
         )
         if project is None:
             return None
 
         data.update(project)
 
-        db.commit()
-        db.refresh(project)
+        await db.commit()
+        await db.refresh(project)
         return project
 
     @override
     async def replace_project(
         self,
-        db: Session,
+        db: AsyncSession,
         project: ProjectTable,
         user_id: UUID | str,
         exists_only: bool = False,
@@ -137,22 +137,40 @@ class SupabaseProjectRepo(ProjectRepo):
                     "Project not found",
                 )
             db.add(project)
-            db.commit()
-            db.refresh(project)
+            await db.commit()
+            await db.refresh(project)
             return project
 
         for column in ProjectTable.__table__.columns.keys():
             setattr(existing, column, getattr(project, column))
         existing.updated_at = datetime.now(UTC)
 
-        db.commit()
-        db.refresh(existing)
+        await db.commit()
+        await db.refresh(existing)
         return existing
 
+    @override
+    async def get_content_version(
+        self,
+        db: AsyncSession,
+        project_id: UUID | str,
+    ) -> int | None:
+        return await db.scalar(
+            select(ProjectTable.content_version).where(ProjectTable.id == project_id)
+        )
+
+    @override
+    async def bump_content_version(
+        self,
+        db: AsyncSession,
+        project_id: UUID | str,
+    ) -> None:
+        await bump_content_version(db, project_id)
+
     @override
     async def delete_project(
         self,
-        db: Session,
+        db: AsyncSession,
         project_id: UUID | str,
         user_id: UUID | str,
     ) -> bool:
@@ -160,14 +178,19 @@ class SupabaseProjectRepo(ProjectRepo):
 
         if project is None:
             return False
+        paths = await db.execute(
+            select(AudioFileTable.file_path_raw, AudioFileTable.file_path_cleaned)
+            .where(AudioFileTable.project_id == project.id)
+        )
         files_to_delete: list[str] = []
-        for file in project.files:
-            files_to_delete.append(file.file_path_raw)
-            if file.file_path_cleaned:
-                files_to_delete.append(file.file_path_cleaned)
+        for raw, cleaned in paths:
+            files_to_delete.append(raw)
+            if cleaned and cleaned != raw:
+                files_to_delete.append(cleaned)
+        files_to_delete += await SSSRepo.instance.list(f"{project.id}/exports")
 
-        await SSSRepo.create_instance().bulk_delete(files_to_delete)
+        await SSSRepo.instance.bulk_delete(files_to_delete)
 
-        db.delete(project)
-        db.commit()
+        await db.delete(project)
+        await db.commit()
         return True
@@ -1,30 +1,32 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from io import BufferedReader, FileIO
 from pathlib import Path
 
-from storage3.types import UploadResponse
-
 
 class SSSRepo(ABC):
+    """Storage Repository, one shared instance created in lifespan"""
 
-    instance_maker: type[SSSRepo]
+    instance: SSSRepo
 
     @classmethod
-    def init[T: SSSRepo](cls, instance_maker: type[T]) -> None:
-        cls.instance_maker = instance_maker
-        
-    @classmethod
-    def create_instance(cls):
-        return cls.instance_maker()
+    def init(cls, repo: SSSRepo) -> None:
+        cls.instance = repo
+
+    async def close(self) -> None:
+        ...
 
     @abstractmethod
     async def upload(
         self,
         data: BufferedReader | bytes | FileIO | str | Path,
         file_path: str,
-    ) -> UploadResponse:
+        content_type: str = 'audio/wav',
+    ) -> str:
+        """Store `data` at `file_path`, overwriting it. Returns the stored path"""
         ...
 
     @abstractmethod
@@ -34,12 +36,41 @@ class SSSRepo(ABC):
     ) -> bytes:
         ...
 
+    @abstractmethod
+    def stream(
+        self,
+        file_path: str,
+    ) -> AsyncIterator[bytes]:
+        """Download in chunks without holding the whole object in memory"""
+        ...
+
+    def export_stream(
+        self,
+        file_path: str,
+    ) -> AsyncIterator[bytes]:
+        """`stream` for consumers that may stall on a slow client, like exports.
+
+        Must not take capacity shared with the rest of the app, a stalled
+        download would otherwise block unrelated uploads and ingests.
+        """
+        return self.stream(file_path)
+
+    async def download_to(
+        self,
+        file_path: str,
+        dest: Path,
+    ) -> Path:
+        with dest.open('wb') as f:
+            async for chunk in self.stream(file_path):
+                await asyncio.to_thread(f.write, chunk)
+        return dest
+
     @abstractmethod
     async def move(
         self,
         file_path: str,
         dest_path: str,
-    ) -> bytes:
+    ) -> None:
         ...
 
     async def delete(
@@ -55,6 +86,14 @@ class SSSRepo(ABC):
     ) -> None:
         ...
 
+    @abstractmethod
+    async def list(
+        self,
+        prefix: str,
+    ) -> list[str]:
+        """Full paths of the objects directly under the `prefix` folder"""
+        ...
+
     @abstractmethod
     async def exists(
         self,
@@ -68,3 +107,12 @@ class SSSRepo(ABC):
         file_path: str,
     ) -> str:
         ...
+
+    @abstractmethod
+    async def create_signed_urls(
+        self,
+        file_paths: list[str],
+        expires_in: int,
+    ) -> dict[str, str]:
+        """Time limited URLs for private objects, keyed by path"""
+        ...
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import shutil
+from collections.abc import AsyncIterator
+from io import BufferedReader, FileIO
+from pathlib import Path
+from typing import override
+from urllib.parse import quote
+
+from app.core.config import Config
+
+from .base import SSSRepo
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class LocalSSSRepo(SSSRepo):
+    """Stores objects under STORAGE_LOCAL_ROOT, for tests and single-node setups"""
+
+    def __init__(self) -> None:
+        self.root = Path(Config.Storage.LOCAL_ROOT).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.public_base = (
+            Config.Storage.PUBLIC_URL or Config.Storage.LOCAL_PUBLIC_URL
+        ).rstrip('/')
+
+    def _path(self, file_path: str) -> Path:
+        path = (self.root / file_path).resolve()
+        if not path.is_relative_to(self.root):
+            raise ValueError(f'Path escapes the storage root: {file_path}')
+        return path
+
+    @override
+    async def upload(
+        self,
+        data: BufferedReader | bytes | FileIO | str | Path,
+        file_path: str,
+        content_type: str = 'audio/wav',
+    ) -> str:
+        dest = self._path(file_path)
+
+        def write() -> None:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(data, bytes):
+                dest.write_bytes(data)
+            elif isinstance(data, (str, Path)):
+                shutil.copyfile(data, dest)
+            else:
+                with dest.open('wb') as f:
+                    shutil.copyfileobj(data, f, CHUNK_SIZE)
+
+        await asyncio.to_thread(write)
+        return file_path
+
+    @override
+    async def download(
+        self,
+        file_path: str,
+    ) -> bytes:
+        return await asyncio.to_thread(self._path(file_path).read_bytes)
+
+    @override
+    async def stream(
+        self,
+        file_path: str,
+    ) -> AsyncIterator[bytes]:
+        with self._path(file_path).open('rb') as f:
+            while chunk := await asyncio.to_thread(f.read, CHUNK_SIZE):
+                yield chunk
+
+    @override
+    async def move(
+        self,
+        file_path: str,
+        dest_path: str,
+    ) -> None:
+        dest = self._path(dest_path)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(self._path(file_path).rename, dest)
+
+    @override
+    async def bulk_delete(
+        self,
+        file_paths: list[str],
+    ) -> None:
+        def delete() -> None:
+            for file_path in file_paths:
+                self._path(file_path).unlink(missing_ok=True)
+
+        await asyncio.to_thread(delete)
+
+    @override
+    async def list(
+        self,
+        prefix: str,
+    ) -> list[str]:
+        folder = self._path(prefix)
+
+        def scan() -> list[str]:
+            if not folder.is_dir():
+                return []
+            return [
+                path.relative_to(self.root).as_posix()
+                for path in folder.iterdir()
+                if path.is_file()
+            ]
+
+        return await asyncio.to_thread(scan)
+
+    @override
+    async def exists(
+        self,
+        file_path: str,
+    ) -> bool:
+        return await asyncio.to_thread(self._path(file_path).is_file)
+
+    @override
+    def get_public_url(
+        self,
+        file_path: str,
+    ) -> str:
+        return f'{self.public_base}/{quote(file_path)}'
+
+    @override
+    async def create_signed_urls(
+        self,
+        file_paths: list[str],
+        expires_in: int,
+    ) -> dict[str, str]:
+        # Files are served as-is, there is nothing to sign
+        return {path: self.get_public_url(path) for path in file_paths}
@@ -1,43 +1,100 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import AsyncIterator
 from io import BufferedReader, FileIO
 from pathlib import Path
-from typing import override
+from typing import IO, override
+from urllib.parse import quote
 
-from storage3.types import UploadResponse
-from supabase import Client, create_client
+import httpx
 
 from app.core.config import Config
 from app.core.logger import get
-from app.entities.models.audio_file import AudioFileTable
-from app.entities.models.auth_user import AuthUserTable
-from app.entities.models.project import ProjectTable
 
 from .base import SSSRepo
 
 logger = get()
 
+CHUNK_SIZE = 1024 * 1024
+DELETE_BATCH_SIZE = 1000
+SIGN_BATCH_SIZE = 1000
+LIST_PAGE_SIZE = 1000
+
 
 class SupabaseSSSRepo(SSSRepo):
+    """Supabase Storage over its REST API with a pooled async client"""
+
     def __init__(self) -> None:
-        self.client: Client = create_client(
-            Config.Supabase.URL, Config.Supabase.SERVICE_ROLE
+        self.bucket = Config.Supabase.STORAGE_BUCKET_NAME
+        self.base_url = f"{Config.Supabase.URL.rstrip('/')}/storage/v1"
+        self.public_base = (
+            Config.Storage.PUBLIC_URL.rstrip("/")
+            or f"{self.base_url}/object/public/{self.bucket}"
         )
-        self.bucket = self.client.storage.from_(Config.Supabase.STORAGE_BUCKET_NAME)
+        connections = Config.Storage.CONCURRENCY + Config.Storage.EXPORT_CONCURRENCY
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={
+                "Authorization": f"Bearer {Config.Supabase.SERVICE_ROLE}",
+                "apikey": Config.Supabase.SERVICE_ROLE,
+            },
+            timeout=httpx.Timeout(Config.Storage.TIMEOUT),
+            # Room for both limiters so stalled exports never starve the pool
+            limits=httpx.Limits(
+                max_connections=connections,
+                max_keepalive_connections=connections,
+            ),
+        )
+        self.sem = asyncio.Semaphore(Config.Storage.CONCURRENCY)
+        self.export_sem = asyncio.Semaphore(Config.Storage.EXPORT_CONCURRENCY)
+
+    @override
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    def _object_url(self, file_path: str) -> str:
+        return f"/object/{self.bucket}/{quote(file_path)}"
 
     @override
     async def upload(
         self,
         data: BufferedReader | bytes | FileIO | str | Path,
         file_path: str,
-    ) -> UploadResponse:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            None,
-            lambda: self.bucket.upload(
-                file_path, data, file_options={"content-type": "audio/wav"}
-            ),
+        content_type: str = "audio/wav",
+    ) -> str:
+        headers = {"content-type": content_type, "x-upsert": "true"}
+
+        async with self.sem:
+            if isinstance(data, bytes):
+                res = await self.client.post(
+                    self._object_url(file_path), content=data, headers=headers
+                )
+            elif isinstance(data, (str, Path)):
+                with Path(data).open("rb") as f:
+                    res = await self._upload_file(f, file_path, headers)
+            else:
+                res = await self._upload_file(data, file_path, headers)
+
+        res.raise_for_status()
+        return file_path
+
+    async def _upload_file(
+        self,
+        f: IO[bytes],
+        file_path: str,
+        headers: dict[str, str],
+    ) -> httpx.Response:
+        async def chunks() -> AsyncIterator[bytes]:
+            while chunk := await asyncio.to_thread(f.read, CHUNK_SIZE):
+                yield chunk
+
+        size = Path(f.name).stat().st_size if isinstance(f.name, str) else None
+        if size is not None:
+            headers = {**headers, "content-length": str(size)}
+
+        return await self.client.post(
+            self._object_url(file_path), content=chunks(), headers=headers
         )
 
     @override
@@ -45,34 +102,129 @@ class SupabaseSSSRepo(SSSRepo):
         self,
         file_path: str,
     ) -> bytes:
-        return self.bucket.download(file_path)
+        async with self.sem:
+            res = await self.client.get(self._object_url(file_path))
+        res.raise_for_status()
+        return res.content
+
+    @override
+    def stream(
+        self,
+        file_path: str,
+    ) -> AsyncIterator[bytes]:
+        return self._stream(file_path, self.sem)
+
+    @override
+    def export_stream(
+        self,
+        file_path: str,
+    ) -> AsyncIterator[bytes]:
+        return self._stream(file_path, self.export_sem)
+
+    async def _stream(
+        self,
+        file_path: str,
+        sem: asyncio.Semaphore,
+    ) -> AsyncIterator[bytes]:
+        async with sem:
+            async with self.client.stream("GET", self._object_url(file_path)) as res:
+                res.raise_for_status()
+                async for chunk in res.aiter_bytes(CHUNK_SIZE):
+                    yield chunk
 
     @override
     async def move(
         self,
         file_path: str,
         dest_path: str,
-    ) -> bytes: ...
+    ) -> None:
+        async with self.sem:
+            res = await self.client.post(
+                "/object/move",
+                json={
+                    "bucketId": self.bucket,
+                    "sourceKey": file_path,
+                    "destinationKey": dest_path,
+                },
+            )
+        res.raise_for_status()
 
     @override
     async def bulk_delete(
         self,
         file_paths: list[str],
     ) -> None:
-        if len(file_paths) <= 0:
-            return
-        self.bucket.remove(file_paths)
+        for i in range(0, len(file_paths), DELETE_BATCH_SIZE):
+            async with self.sem:
+                res = await self.client.request(
+                    "DELETE",
+                    f"/object/{self.bucket}",
+                    json={"prefixes": file_paths[i:i + DELETE_BATCH_SIZE]},
+                )
+            res.raise_for_status()
+
+    @override
+    async def list(
+        self,
+        prefix: str,
+    ) -> list[str]:
+        prefix = prefix.strip("/")
+        paths: list[str] = []
+        offset = 0
+        while True:
+            async with self.sem:
+                res = await self.client.post(
+                    f"/object/list/{self.bucket}",
+                    json={"prefix": prefix, "limit": LIST_PAGE_SIZE, "offset": offset},
+                )
+            res.raise_for_status()
+            items = res.json()
+            # Folders come back with a null id
+            paths += [f"{prefix}/{item['name']}" for item in items if item.get("id")]
+            if len(items) < LIST_PAGE_SIZE:
+                return paths
+            offset += LIST_PAGE_SIZE
 
     @override
     async def exists(
         self,
         file_path: str,
     ) -> bool:
-        return self.bucket.exists(file_path)
+        async with self.sem:
+            res = await self.client.head(self._object_url(file_path))
+        # Storage answers 400 rather than 404 for some missing objects
+        if res.status_code in (400, 404):
+            return False
+        res.raise_for_status()
+        return True
 
     @override
     def get_public_url(
         self,
         file_path: str,
     ) -> str:
-        return self.bucket.get_public_url(file_path)
+        return f"{self.public_base}/{quote(file_path)}"
+
+    @override
+    async def create_signed_urls(
+        self,
+        file_paths: list[str],
+        expires_in: int,
+    ) -> dict[str, str]:
+        urls: dict[str, str] = {}
+        for i in range(0, len(file_paths), SIGN_BATCH_SIZE):
+            async with self.sem:
+                res = await self.client.post(
+                    f"/object/sign/{self.bucket}",
+                    json={
+                        "expiresIn": expires_in,
+                        "paths": file_paths[i:i + SIGN_BATCH_SIZE],
+                    },
+                )
+            res.raise_for_status()
+            for item in res.json():
+                if item.get("error") or not item.get("signedURL"):
+                    logger.warning(f"Failed to sign {item.get('path')}: {item.get('error')}")
+                    continue
+                urls[item["path"]] = f"{self.base_url}{item['signedURL']}"
+        return urls
@@ -0,0 +1,74 @@
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import override
+
+import httpx
+
+from app.core.logger import get
+from app.entities.types.transcription_result import TranscriptionResult
+from app.shared.services.adaptive_limiter import AdaptiveLimiter
+from .base import STTRepo
+
+logger = get()
+
+
+def _is_overload(e: Exception) -> bool:
+    if isinstance(e, httpx.TimeoutException):
+        return True
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code >= 500
+    return False
+
+
+class AdaptiveSTTRepo(STTRepo):
+    """Runs another STT repo under an adaptive concurrency limit"""
+
+    def __init__(self, repo: STTRepo, limiter: AdaptiveLimiter) -> None:
+        self.repo = repo
+        self.limiter = limiter
+
+    @override
+    async def close(self) -> None:
+        await self.repo.close()
+
+    async def _limited[T: (TranscriptionResult, list[TranscriptionResult])](
+        self,
+        call: Callable[[], Awaitable[T]],
+    ) -> T:
+        await self.limiter.acquire()
+        t0 = time.perf_counter()
+        try:
+            result = await call()
+        except Exception as e:
+            overloaded = _is_overload(e)
+            self.limiter.release(None, dropped=overloaded)
+            if overloaded:
+                logger.warning(
+                    f'ASR overloaded ({type(e).__name__}), limit now {self.limiter.limit}'
+                )
+            raise
+
+        results = result if isinstance(result, list) else [result]
+        # Batches are judged per clip so they don't skew the latency baseline
+        self.limiter.release(
+            (time.perf_counter() - t0) / max(1, len(results)),
+            dropped=any(r.status_code >= 500 for r in results),
+        )
+        return result
+
+    @override
+    async def transcribe_from_sss_path(self, path: str) -> TranscriptionResult:
+        return await self._limited(lambda: self.repo.transcribe_from_sss_path(path))
+
+    @override
+    async def transcribe_batch(self, paths: list[str]) -> list[TranscriptionResult]:
+        return await self._limited(lambda: self.repo.transcribe_batch(paths))
+
+    @override
+    async def transcribe_from_bytes(self, data: bytes, format: str = 'wav') -> TranscriptionResult:
+        return await self._limited(lambda: self.repo.transcribe_from_bytes(data, format))
+
+    @override
+    async def transcribe_from_local_path(self, path: Path) -> TranscriptionResult:
+        return await self._limited(lambda: self.repo.transcribe_from_local_path(path))
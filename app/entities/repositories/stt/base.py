@@ -15,10 +15,18 @@ class STTRepo(ABC):
     def init(cls, repo: STTRepo) -> None:
         cls.instance = repo
 
+    async def close(self) -> None:
+        ...
+
     @abstractmethod
     async def transcribe_from_sss_path(self, path: str) -> TranscriptionResult:
         ...
 
+    @abstractmethod
+    async def transcribe_batch(self, paths: list[str]) -> list[TranscriptionResult]:
+        """Transcribe several storage paths in one request, results keep their order"""
+        ...
+
     @abstractmethod
     async def transcribe_from_bytes(self, data: bytes, format: str = 'wav') -> TranscriptionResult:
         ...
@@ -10,23 +10,74 @@ from .base import STTRepo
 
 class ExternalSTTRepo(STTRepo):
 
+    def __init__(self) -> None:
+        # One pooled client for every transcription so connections are reused
+        self.client = httpx.AsyncClient(
+            base_url=Config.ASR_URL,
+            http2=Config.ASR_HTTP2,
+            timeout=httpx.Timeout(Config.ASR_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=Config.ASR_MAX_CONNECTIONS,
+                max_keepalive_connections=Config.ASR_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=Config.ASR_KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    @override
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    @staticmethod
+    def _parse(res: httpx.Response) -> TranscriptionResult:
+        if res.status_code >= 500:
+            res.raise_for_status()
+
+        data: dict[str, Any] = res.json()
+        return TranscriptionResult(**data)
+
     @override
     async def transcribe_from_sss_path(self, path: str) -> TranscriptionResult:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(Config.ASR_TIMEOUT)) as client:
-            res = await client.post(
-                f'{Config.ASR_URL}/transcribe',
-                params={
-                    'audio_path': path
-                }
-            )
-            
-            data: dict[str, Any] = res.json()
-            return TranscriptionResult(**data)
+        res = await self.client.post(
+            '/transcribe',
+            params={
+                'audio_path': path
+            }
+        )
+        return self._parse(res)
+
+    @override
+    async def transcribe_batch(self, paths: list[str]) -> list[TranscriptionResult]:
+        res = await self.client.post(
+            '/transcribe/batch',
+            json={
+                'audio_paths': paths
+            }
+        )
+        if res.status_code >= 500:
+            res.raise_for_status()
+
+        data: list[dict[str, Any]] = res.json()
+        return [TranscriptionResult(**item) for item in data]
 
     @override
     async def transcribe_from_bytes(self, data: bytes, format: str = 'wav') -> TranscriptionResult:
-        ...
+        res = await self.client.post(
+            '/transcribe/upload',
+            files={
+                'file': (f'audio.{format}', data, f'audio/{format}')
+            }
+        )
+        return self._parse(res)
 
     @override
     async def transcribe_from_local_path(self, path: Path) -> TranscriptionResult:
-        ...
+        format = path.suffix.removeprefix('.') or 'wav'
+        # httpx streams file objects in chunks instead of reading them whole
+        with path.open('rb') as f:
+            res = await self.client.post(
+                '/transcribe/upload',
+                files={
+                    'file': (path.name, f, f'audio/{format}')
+                }
+            )
+        return self._parse(res)
@@ -19,10 +19,16 @@ class MockSTTRepo(STTRepo):
             model_used='mock'
         )
 
+    @override
+    async def transcribe_batch(self, paths: list[str]) -> list[TranscriptionResult]:
+        return list(await asyncio.gather(
+            *(self.transcribe_from_sss_path(path) for path in paths)
+        ))
+
     @override
     async def transcribe_from_bytes(self, data: bytes, format: str = 'wav') -> TranscriptionResult:
-        ...
+        return await self.transcribe_from_sss_path(f'audio.{format}')
 
     @override
     async def transcribe_from_local_path(self, path: Path) -> TranscriptionResult:
-        ...
+        return await self.transcribe_from_sss_path(path.name)
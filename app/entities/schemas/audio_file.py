@@ -15,6 +15,9 @@ class AudioFile(BaseModel):
     file_size: int | None
     duration: int | None
     format: str | None
+    sample_rate: int | None = None
+    channels: int | None = None
+    codec: str | None = None
     transcription_status: ProcessingStatus | None
     transcription_content: str | None
     error_message: str | None
@@ -29,7 +29,7 @@ class AudioFileEvent(SEvent):
         audio: AudioFileTable,
         eid: str,
         event_type: EventType,
-        public_url: str,
+        public_url: str | None,
     ):
         return cls(
             eid=eid,
@@ -0,0 +1,45 @@
+from uuid import UUID
+
+from app.entities.schemas.events.event import SEvent
+from app.entities.types.enums.event_type import EventType
+from app.entities.types.enums.processing_status import ProcessingStatus
+from app.entities.types.task_log import ChangedFileStatusT, TaskLog
+
+
+class ProcessingEvent(SEvent):
+    project_id: str
+    """UUID as str"""
+    status: ProcessingStatus
+    completed_tasks: int
+    total_tasks: int
+    message: str
+    error: int | None
+    task_statuses: list[ChangedFileStatusT]
+    stop_connections: bool
+
+    @classmethod
+    def from_log(cls, log: TaskLog):
+        return cls(
+            eid=str(log.project_id),
+            event_type=EventType.other,
+            project_id=str(log.project_id),
+            status=log.status,
+            completed_tasks=log.completed_tasks,
+            total_tasks=log.total_tasks,
+            message=log.message,
+            error=log.error,
+            task_statuses=log.task_statuses,
+            stop_connections=log.stop_connections,
+        )
+
+    def to_log(self) -> TaskLog:
+        return TaskLog(
+            project_id=UUID(self.project_id),
+            status=self.status,
+            completed_tasks=self.completed_tasks,
+            total_tasks=self.total_tasks,
+            message=self.message,
+            error=self.error,
+            task_statuses=self.task_statuses,
+            stop_connections=self.stop_connections,
+        )
@@ -6,3 +6,7 @@ from sqlalchemy.orm import Query
 class ListingParam:
     limit: int
     page: int
+    cursor: str | None
+    """Opaque `next_cursor` of the previous page, overrides `page`"""
+    with_total: bool | None
+    """Count matching rows, by default only when no cursor is given"""
@@ -39,14 +39,17 @@ class UpdateAudioFileSchema(BaseModel):
 
         return f"{file_name}.wav"
 
-    def update(self, file: AudioFileTable):
-        if self.file_name:
+    def update(self, file: AudioFileTable) -> bool:
+        """Apply the changes to `file`, returns whether anything changed"""
+        changed = False
+        if self.file_name and self.file_name != file.file_name:
             file.file_name = self.file_name
             file.updated_at = datetime.now(UTC)
+            changed = True
 
         if self.transcription_content is not None:
             if file.transcription_status == ProcessingStatus.processing:
-                return
+                return changed
 
             if self.transcription_content:
                 file.transcription_content = self.transcription_content
@@ -56,4 +59,10 @@ class UpdateAudioFileSchema(BaseModel):
                 file.transcription_content = None
                 file.transcription_status = ProcessingStatus.pending
 
+            # Edited text is not ASR output, keep it out of the cache
+            file.transcription_model = None
+
             file.updated_at = datetime.now(UTC)
+            changed = True
+
+        return changed
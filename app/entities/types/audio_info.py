@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class AudioInfo:
+    duration_ms: int | None
+    sample_rate: int | None
+    channels: int | None
+    codec: str | None
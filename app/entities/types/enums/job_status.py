@@ -0,0 +1,8 @@
+from enum import StrEnum
+
+
+class JobStatus(StrEnum):
+    queued = "queued"
+    leased = "leased"
+    completed = "completed"
+    failed = "failed"
@@ -1,16 +1,46 @@
 from __future__ import annotations
 
 from enum import StrEnum
+from typing import Any
 
-from sqlalchemy import Column, asc, desc
-from sqlalchemy.orm import Query
+from sqlalchemy import ColumnElement, Select, and_, asc, desc, or_
+from sqlalchemy.orm import InstrumentedAttribute
 
 
 class Ordering(StrEnum):
     asc = "asc"
     desc = "desc"
 
-    def apply[T](self, query: Query[T], column: Column[T]) -> Query[T]:
+    def apply[T](
+        self,
+        query: Select[tuple[T]],
+        column: InstrumentedAttribute[Any],
+        tiebreak: InstrumentedAttribute[Any],
+    ) -> Select[tuple[T]]:
+        """`tiebreak` makes the order total. NULLs keep Postgres' placement,
+        last ascending and first descending, so one (column, tiebreak)
+        index serves both directions"""
         if self == Ordering.desc:
-            return query.order_by(desc(column))
-        return query.order_by(asc(column))
+            return query.order_by(desc(column), desc(tiebreak))
+        return query.order_by(asc(column), asc(tiebreak))
+
+    def after(
+        self,
+        column: InstrumentedAttribute[Any],
+        tiebreak: InstrumentedAttribute[Any],
+        value: Any,
+        last: Any,
+    ) -> ColumnElement[bool]:
+        """Rows that come after (`value`, `last`) in the order from `apply`"""
+        if self == Ordering.desc:
+            if value is None:
+                return or_(
+                    and_(column.is_(None), tiebreak < last), column.is_not(None)
+                )
+            return or_(column < value, and_(column == value, tiebreak < last))
+
+        if value is None:
+            return and_(column.is_(None), tiebreak > last)
+        return or_(
+            column > value, and_(column == value, tiebreak > last), column.is_(None)
+        )
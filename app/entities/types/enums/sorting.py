@@ -1,6 +1,7 @@
 from enum import StrEnum
+from typing import Any
 
-from sqlalchemy import Column
+from sqlalchemy.orm import InstrumentedAttribute
 
 from app.entities.models.audio_file import AudioFileTable
 from app.entities.models.project import ProjectTable
@@ -13,7 +14,7 @@ class ProjectSorting(StrEnum):
     created_at = "created_at"
     updated_at = "updated_at"
 
-    def column(self) -> Column[ProjectTable]:
+    def column(self) -> InstrumentedAttribute[Any]:
         mapping = {
             ProjectSorting.project_name: ProjectTable.name,
             ProjectSorting.status: ProjectTable.status,
@@ -33,7 +34,7 @@ class AudioFileSorting(StrEnum):
     duration = "duration"
     file_format = "file_format"
 
-    def column(self) -> Column[AudioFileTable]:
+    def column(self) -> InstrumentedAttribute[Any]:
         mapping = {
             AudioFileSorting.file_name: AudioFileTable.file_name,
             AudioFileSorting.status: AudioFileTable.transcription_status,
@@ -4,8 +4,9 @@ from typing import TypedDict
 class PaginationMeta(TypedDict):
     page: int
     limit: int
-    total_pages: int
-    total_items: int
+    total_pages: int | None
+    total_items: int | None
+    next_cursor: str | None
 
 
 class Paginated[T](TypedDict):
@@ -5,6 +5,7 @@ import sys
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 
 from app.api.v1 import load_routers
 from app.core import logger
@@ -12,7 +13,6 @@ from app.core.config import Config
 from app.core.handlers.log_handlers.telegram import TelegramLogHandler
 from app.core.lifespan import lifespan
 from app.core.middlewares.logger import ExceptionLoggingMiddleware
-from app.shared.services.metadata_exporter import CSVExporter, add_exporter
 
 app = FastAPI(lifespan=lifespan)
 
@@ -28,6 +28,13 @@ app.add_middleware(
 # Load API routers
 load_routers(app)
 
+if Config.Storage.BACKEND == 'local':
+    app.mount(
+        '/storage',
+        StaticFiles(directory=Config.Storage.LOCAL_ROOT, check_dir=False),
+        name='storage',
+    )
+
 
 @app.get('/')
 async def root():
@@ -55,9 +62,6 @@ def main():
     app.add_middleware(ExceptionLoggingMiddleware)
     logger.add_handler(TelegramLogHandler(level=logging.WARNING))
 
-    add_exporter('csv', 'Wav2Vec2', CSVExporter(','))
-    add_exporter('tsv', 'Wav2Vec2', CSVExporter('\t'))
-
     try:
         server.run()
     except KeyboardInterrupt:
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit driven by observed latency and failures.
+
+    The limit grows by roughly one per window of successful calls while p95
+    latency stays within `tolerance` of the best seen, shrinks gently when
+    latency inflates and halves on timeouts or server errors.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        tolerance: float = 1.5,
+        backoff: float = 0.5,
+        window: int = 50,
+        on_change: Callable[[int], None] | None = None,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.on_change = on_change
+
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._since_check = 0
+        self._baseline: float | None = None
+        self._last_decrease = 0.0
+        self._drops = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self) -> None:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self._in_flight -= 1
+                self._wake()
+            elif fut in self._waiters:
+                self._waiters.remove(fut)
+            raise
+
+    def release(self, latency: float | None, dropped: bool = False) -> None:
+        in_flight = self._in_flight
+        self._in_flight -= 1
+
+        if dropped:
+            self._on_drop()
+        elif latency is not None:
+            self._on_success(latency, saturated=in_flight >= self.limit)
+
+        self._wake()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'limit': self.limit,
+            'in_flight': self._in_flight,
+            'waiting': len(self._waiters),
+            'p95_latency': self._p95(),
+            'baseline_latency': self._baseline,
+            'drops': self._drops,
+        }
+
+    def _on_success(self, latency: float, saturated: bool) -> None:
+        self._latencies.append(latency)
+        self._since_check += 1
+        if self._since_check < self._latencies.maxlen:  # type: ignore
+            if saturated:
+                # Additive increase, about +1 per `limit` successful calls
+                self._set_limit(self._limit + 1 / self._limit)
+            return
+
+        self._since_check = 0
+        p95 = self._p95()
+        assert p95 is not None
+
+        if self._baseline is None or p95 < self._baseline:
+            self._baseline = p95
+        elif p95 > self._baseline * self.tolerance:
+            self._set_limit(self._limit * 0.9)
+        else:
+            # Let the baseline follow slow, genuine drifts of the backend
+            self._baseline *= 1.01
+
+    def _on_drop(self) -> None:
+        self._drops += 1
+        now = time.monotonic()
+        # A burst of failures from one overload should only back off once
+        cooldown = self._baseline or 1.0
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self._set_limit(self._limit * self.backoff)
+
+    def _set_limit(self, limit: float) -> None:
+        before = self.limit
+        self._limit = min(max(limit, self.min_limit), self.max_limit)
+        if self.limit != before and self.on_change is not None:
+            self.on_change(self.limit)
+
+    def _p95(self) -> float | None:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            fut = self._waiters.popleft()
+            if fut.done():
+                continue
+            self._in_flight += 1
+            fut.set_result(None)
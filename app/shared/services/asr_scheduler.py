@@ -0,0 +1,127 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from app.core.config import Config
+
+
+class ASRScheduler:
+    """Process-wide cap on in-flight ASR requests.
+
+    Free slots are handed out round-robin between users, then between the
+    projects of each user, so one large project cannot starve the others.
+    """
+
+    capacity: int = Config.ASR_MAX_IN_FLIGHT
+
+    _in_flight: int = 0
+    _waiting: OrderedDict[str, OrderedDict[str, deque[asyncio.Future[None]]]] = (
+        OrderedDict()
+    )
+
+    _granted: int = 0
+    _total_wait: float = 0.0
+    _max_wait: float = 0.0
+    _recent_waits: deque[float] = deque(maxlen=1000)
+
+    @classmethod
+    @asynccontextmanager
+    async def slot(cls, user_id: str, project_id: str) -> AsyncGenerator[None, Any]:
+        await cls.acquire(user_id, project_id)
+        try:
+            yield
+        finally:
+            cls.release()
+
+    @classmethod
+    async def acquire(cls, user_id: str, project_id: str) -> None:
+        t0 = time.perf_counter()
+
+        if cls._in_flight < cls.capacity and not cls._waiting:
+            cls._in_flight += 1
+        else:
+            fut = asyncio.get_running_loop().create_future()
+            projects = cls._waiting.setdefault(user_id, OrderedDict())
+            projects.setdefault(project_id, deque()).append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled():
+                    # Slot was granted right before the cancellation landed
+                    cls.release()
+                else:
+                    cls._discard(user_id, project_id, fut)
+                raise
+
+        cls._record_wait(time.perf_counter() - t0)
+
+    @classmethod
+    def release(cls) -> None:
+        cls._in_flight -= 1
+        cls._dispatch()
+
+    @classmethod
+    def set_capacity(cls, capacity: int) -> None:
+        cls.capacity = max(1, capacity)
+        cls._dispatch()
+
+    @classmethod
+    def stats(cls) -> dict[str, Any]:
+        waits = sorted(cls._recent_waits)
+        return {
+            'capacity': cls.capacity,
+            'in_flight': cls._in_flight,
+            'queue_depth': sum(
+                len(q) for projects in cls._waiting.values() for q in projects.values()
+            ),
+            'waiting_users': len(cls._waiting),
+            'granted': cls._granted,
+            'avg_wait': cls._total_wait / cls._granted if cls._granted else 0.0,
+            'max_wait': cls._max_wait,
+            'p95_wait': waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0,
+        }
+
+    @classmethod
+    def _dispatch(cls) -> None:
+        while cls._in_flight < cls.capacity and cls._waiting:
+            user_id, projects = next(iter(cls._waiting.items()))
+            project_id, queue = next(iter(projects.items()))
+            fut = queue.popleft()
+
+            # Rotate so the next slot goes to someone else
+            if queue:
+                projects.move_to_end(project_id)
+            else:
+                del projects[project_id]
+            if projects:
+                cls._waiting.move_to_end(user_id)
+            else:
+                del cls._waiting[user_id]
+
+            if fut.done():
+                continue
+            cls._in_flight += 1
+            fut.set_result(None)
+
+    @classmethod
+    def _discard(cls, user_id: str, project_id: str, fut: asyncio.Future[None]) -> None:
+        projects = cls._waiting.get(user_id)
+        if projects is None or project_id not in projects:
+            return
+        queue = projects[project_id]
+        if fut in queue:
+            queue.remove(fut)
+        if not queue:
+            del projects[project_id]
+        if not projects:
+            del cls._waiting[user_id]
+
+    @classmethod
+    def _record_wait(cls, waited: float) -> None:
+        cls._granted += 1
+        cls._total_wait += waited
+        cls._max_wait = max(cls._max_wait, waited)
+        cls._recent_waits.append(waited)
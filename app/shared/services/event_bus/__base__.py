@@ -0,0 +1,15 @@
+from collections.abc import Callable
+from typing import Protocol
+
+from app.entities.schemas.events.event import SEvent
+
+
+class EventBus(Protocol):
+    async def start(self, on_event: Callable[[SEvent], None]) -> None:
+        ...
+
+    def publish(self, event: SEvent) -> None:
+        ...
+
+    async def close(self) -> None:
+        ...
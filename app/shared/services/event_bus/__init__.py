@@ -0,0 +1,7 @@
+from app.shared.services.event_bus.__base__ import EventBus
+from app.shared.services.event_bus.postgres import PostgresEventBus
+
+__all__ = [
+    'EventBus',
+    'PostgresEventBus',
+]
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import re
+from collections.abc import Callable
+from contextlib import suppress
+
+import asyncpg
+
+from app.core.config import Config
+from app.core.logger import get
+from app.entities.schemas.events.event import SEvent
+
+logger = get()
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+_MAX_PAYLOAD = 7900
+_MAX_MESSAGE = 1000
+
+
+def _dsn(url: str) -> str:
+    return re.sub(r'^postgres(ql)?(\+\w+)?://', 'postgresql://', url)
+
+
+def _event_types() -> dict[str, type[SEvent]]:
+    return {cls.__name__: cls for cls in SEvent.__subclasses__()}
+
+
+class PostgresEventBus:
+    """Fans events out to every process through Postgres LISTEN/NOTIFY"""
+
+    def __init__(self, channel: str = 'somleng_events', listen: bool = True) -> None:
+        self.channel = channel
+        self.listen = listen
+        self._outbox = asyncio.Queue[str]()
+        self._sender: asyncio.Task[None] | None = None
+        self._listener: asyncio.Task[None] | None = None
+        self._on_event: Callable[[SEvent], None] | None = None
+
+    async def start(self, on_event: Callable[[SEvent], None]) -> None:
+        self._on_event = on_event
+        self._sender = asyncio.create_task(self._send_forever())
+        if self.listen:
+            self._listener = asyncio.create_task(self._listen_forever())
+
+    def publish(self, event: SEvent) -> None:
+        payload = self._encode(event)
+        if payload is not None:
+            self._outbox.put_nowait(payload)
+
+    async def close(self) -> None:
+        for task in (self._sender, self._listener):
+            if task is None:
+                continue
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    def _encode(self, event: SEvent) -> str | None:
+        name = type(event).__name__
+        data = event.model_dump(mode='json')
+        payload = json.dumps({'type': name, 'data': data})
+        if len(payload.encode()) <= _MAX_PAYLOAD:
+            return payload
+
+        # Subscribers refetch the file when the content is missing
+        if 'transcription_content' in data:
+            data['transcription_content'] = None
+        for task_status in data.get('task_statuses') or []:
+            task_status['content'] = None
+        payload = json.dumps({'type': name, 'data': data})
+
+        if len(payload.encode()) > _MAX_PAYLOAD and data.get('task_statuses'):
+            # Per-file states also arrive as file events, counts are kept
+            data['task_statuses'] = []
+            payload = json.dumps({'type': name, 'data': data})
+
+        if len(payload.encode()) > _MAX_PAYLOAD and data.get('stop_connections'):
+            # Terminal events close the streams, they go out whatever it takes
+            data['message'] = data.get('message', '')[:_MAX_MESSAGE]
+            payload = json.dumps({'type': name, 'data': data})
+
+        size = len(payload.encode())
+        if size > _MAX_PAYLOAD:
+            logger.error(f'Dropped oversized {name} ({size} bytes): {event!r:.500}')
+            return None
+
+        logger.warning(f'Trimmed oversized {name} to {size} bytes to fit NOTIFY')
+        return payload
+
+    def _decode(self, payload: str) -> SEvent | None:
+        message = json.loads(payload)
+        event_type = _event_types().get(message['type'])
+        if event_type is None:
+            logger.warning(f'Received unknown event type {message["type"]}')
+            return None
+        return event_type.model_validate(message['data'])
+
+    def _on_notify(self, conn: object, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = self._decode(payload)
+        except Exception:
+            logger.error('Failed to decode bus event', exc_info=True)
+            return
+
+        if event is not None and self._on_event is not None:
+            self._on_event(event)
+
+    async def _connect(self) -> asyncpg.Connection:
+        return await asyncpg.connect(_dsn(Config.Supabase.DATABASE_URL))
+
+    async def _send_forever(self) -> None:
+        conn: asyncpg.Connection | None = None
+        while True:
+            payload = await self._outbox.get()
+            while True:
+                try:
+                    if conn is None or conn.is_closed():
+                        conn = await self._connect()
+                    await conn.execute('SELECT pg_notify($1, $2)', self.channel, payload)
+                    break
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.warning('Event bus publish failed, retrying', exc_info=True)
+                    conn = None
+                    await asyncio.sleep(1)
+
+    async def _listen_forever(self) -> None:
+        while True:
+            conn: asyncpg.Connection | None = None
+            try:
+                conn = await self._connect()
+                await conn.add_listener(self.channel, self._on_notify)
+                logger.info(f'Listening for events on "{self.channel}"')
+                while True:
+                    await asyncio.sleep(5)
+                    # Surfaces dead connections that never got a FIN
+                    await conn.execute('SELECT 1')
+            except asyncio.CancelledError:
+                if conn is not None:
+                    await conn.close()
+                raise
+            except Exception:
+                logger.warning('Event bus listener failed, reconnecting', exc_info=True)
+                await asyncio.sleep(1)
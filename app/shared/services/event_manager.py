@@ -5,12 +5,26 @@ from contextlib import suppress
 from typing import Any
 
 from app.entities.schemas.events.event import SEvent
+from app.shared.services.event_bus import EventBus
 
 
 class EventManager:
     _subscribers: dict[type[SEvent], list[Callable[[Any], None] | Queue[Any]]] = (
         defaultdict(list)
     )
+    _bus: EventBus | None = None
+
+    @classmethod
+    async def use_bus(cls, bus: EventBus) -> None:
+        """Route events through `bus` so subscribers in every process see them"""
+        await bus.start(cls.dispatch)
+        cls._bus = bus
+
+    @classmethod
+    async def close(cls) -> None:
+        if cls._bus is not None:
+            await cls._bus.close()
+            cls._bus = None
 
     @classmethod
     def subscribe[T: SEvent](
@@ -49,6 +63,13 @@ class EventManager:
 
     @classmethod
     def notify(cls, event: SEvent) -> None:
+        if cls._bus is not None:
+            cls._bus.publish(event)
+            return
+        cls.dispatch(event)
+
+    @classmethod
+    def dispatch(cls, event: SEvent) -> None:
         listeners = cls._subscribers.get(type(event))
 
         if not listeners:
@@ -76,21 +97,38 @@ class EventManager:
             sub(event)
 
     @classmethod
-    def get_stream[T: SEvent](
+    def get_events[T: SEvent](
         cls,
         event_type: type[T],
         filter: Callable[[T], bool],
-    ) -> AsyncGenerator[str, Any]:
+    ) -> AsyncGenerator[T, Any]:
         queue = Queue[T]()
         cls.subscribe(event_type, queue)
 
         async def generator():
             try:
                 while True:
-                    log = await queue.get()
-                    if filter(log):
-                        yield f"data: {log.model_dump_json()}\n\n"
+                    event = await queue.get()
+                    if filter(event):
+                        yield event
             finally:
                 cls.unsubscribe(event_type, queue)
 
-        return generator()
\ No newline at end of file
+        return generator()
+
+    @classmethod
+    def get_stream[T: SEvent](
+        cls,
+        event_type: type[T],
+        filter: Callable[[T], bool],
+    ) -> AsyncGenerator[str, Any]:
+        events = cls.get_events(event_type, filter)
+
+        async def generator():
+            try:
+                async for log in events:
+                    yield f"data: {log.model_dump_json()}\n\n"
+            finally:
+                await events.aclose()
+
+        return generator()
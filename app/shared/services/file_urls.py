@@ -0,0 +1,80 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+import httpx
+
+from app.core.config import Config
+from app.core.logger import get
+from app.entities.repositories.sss.base import SSSRepo
+
+logger = get()
+
+
+class FileURLs:
+    """URLs handed to clients for stored files.
+
+    Public URLs are plain string formatting. With STORAGE_SIGNED_URLS the
+    bucket is treated as private: missing URLs for a page are signed in one
+    request and kept until less than half their lifetime is left, so
+    repeated listings and events don't re-sign. A path that can't be signed
+    gets None, a public URL would not open on a private bucket anyway.
+    """
+
+    max_size: int = Config.Storage.SIGNED_URL_CACHE_SIZE
+    ttl: int = Config.Storage.SIGNED_URL_TTL
+
+    _signed: OrderedDict[str, tuple[str, float]] = OrderedDict()
+    _hits: int = 0
+    _misses: int = 0
+
+    @classmethod
+    async def get(cls, path: str) -> str | None:
+        return (await cls.get_many([path]))[0]
+
+    @classmethod
+    async def get_many(cls, paths: list[str]) -> list[str | None]:
+        if not Config.Storage.SIGNED_URLS:
+            return [SSSRepo.instance.get_public_url(path) for path in paths]
+
+        now = time.monotonic()
+        urls: dict[str, str] = {}
+        missing: list[str] = []
+        for path in dict.fromkeys(paths):
+            entry = cls._signed.get(path)
+            if entry is not None and entry[1] - now > cls.ttl / 2:
+                cls._signed.move_to_end(path)
+                urls[path] = entry[0]
+                cls._hits += 1
+            else:
+                missing.append(path)
+                cls._misses += 1
+
+        if missing:
+            try:
+                signed = await SSSRepo.instance.create_signed_urls(missing, cls.ttl)
+            except httpx.HTTPError as e:
+                # URLs are a convenience, never fail a listing or transcription
+                logger.warning(f'Failed to sign {len(missing)} URL(s): {e!r}')
+                signed = {}
+            expires_at = now + cls.ttl
+            for path, url in signed.items():
+                urls[path] = url
+                cls._signed[path] = (url, expires_at)
+                cls._signed.move_to_end(path)
+            while len(cls._signed) > cls.max_size:
+                cls._signed.popitem(last=False)
+
+        return [urls.get(path) for path in paths]
+
+    @classmethod
+    def stats(cls) -> dict[str, Any]:
+        lookups = cls._hits + cls._misses
+        return {
+            'signed': Config.Storage.SIGNED_URLS,
+            'size': len(cls._signed),
+            'max_size': cls.max_size,
+            'hits': cls._hits,
+            'misses': cls._misses,
+            'hit_rate': cls._hits / lookups if lookups else 0.0,
+        }
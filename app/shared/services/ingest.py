@@ -0,0 +1,47 @@
+from pathlib import Path
+from uuid import UUID
+
+import httpx
+
+from app.core.config import Config
+from app.core.logger import get
+from app.entities.types.transcription_result import TranscriptionResult
+from app.shared.services.segmenter import transcribe_local
+from app.shared.services.transcription_cache import TranscriptionCache
+
+logger = get()
+
+
+async def transcribe_at_ingest(
+    path: Path,
+    user_id: UUID | str,
+    project_id: UUID | str,
+    content_hash: str | None = None,
+    duration_ms: int | None = None,
+) -> TranscriptionResult | None:
+    """Transcribe a file while it is still on local disk (ASR_ON_INGEST).
+
+    Returns None when disabled or when the attempt fails, leaving the file
+    pending for the regular processing run.
+    """
+    if not Config.ASR_ON_INGEST:
+        return None
+
+    cached = await TranscriptionCache.get(content_hash)
+    if cached is not None:
+        return cached
+
+    try:
+        result = await transcribe_local(path, user_id, project_id, duration_ms)
+    except (httpx.HTTPError, RuntimeError) as e:
+        logger.warning(f'Ingest transcription failed for {path.name}: {e!r}')
+        return None
+
+    if result.status_code != 201:
+        logger.warning(
+            f'Ingest transcription failed for {path.name} ({result.status_code})'
+        )
+        return None
+
+    TranscriptionCache.put(content_hash, result)
+    return result
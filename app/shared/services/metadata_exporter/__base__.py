@@ -1,9 +1,9 @@
-from io import BytesIO
+from collections.abc import AsyncIterator
 from typing import Protocol
-from zipfile import ZipFile
 
 from app.entities.models.project import ProjectTable
 
 class Exporter(Protocol):
-    async def export(self, project: ProjectTable) -> BytesIO:
+    def export(self, project: ProjectTable) -> AsyncIterator[bytes]:
+        """Archive chunks, produced while the client downloads"""
         ...
\ No newline at end of file
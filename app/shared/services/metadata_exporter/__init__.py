@@ -5,6 +5,8 @@ __all__ = [
     'Exporter',
     'add_exporter',
     'get_exporter',
+    'list_exporters',
+    'register_exporters',
     'CSVExporter',
 ]
 
@@ -17,3 +19,13 @@ def add_exporter(supported_format: str, toolkit: str, exporter: Exporter) -> Non
 
 def get_exporter(format: str, toolkit: str) -> Exporter | None:
     return _exporters.get((format, toolkit))
+
+
+def list_exporters() -> list[tuple[str, str, Exporter]]:
+    return [(format, toolkit, e) for (format, toolkit), e in _exporters.items()]
+
+
+def register_exporters() -> None:
+    """Built-in exporters, registered by both the API and the worker"""
+    add_exporter('csv', 'Wav2Vec2', CSVExporter(','))
+    add_exporter('tsv', 'Wav2Vec2', CSVExporter('\t'))
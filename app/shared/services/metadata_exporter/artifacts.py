@@ -0,0 +1,152 @@
+import asyncio
+import os
+import re
+import tempfile
+from collections.abc import AsyncIterator, Coroutine
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from app.core.logger import get
+from app.entities.models.project import ProjectTable
+from app.entities.repositories.project.base import ProjectRepo
+from app.entities.repositories.sss.base import SSSRepo
+from app.entities.types.enums.processing_status import ProcessingStatus
+from app.shared.services.metadata_exporter import list_exporters
+from app.shared.services.metadata_exporter.__base__ import Exporter
+
+logger = get()
+
+
+class ExportArtifacts:
+    """Finished export archives kept in storage.
+
+    Keyed by project content version, format and toolkit, so any change to
+    the project's files or transcriptions simply points at a new key. Builds
+    for a superseded version are dropped, and storing one prunes older ones.
+    """
+
+    _tasks: set[asyncio.Task[None]] = set()
+
+    @staticmethod
+    def folder(project_id: UUID | str) -> str:
+        return f'{project_id}/exports'
+
+    @classmethod
+    def key(cls, project: ProjectTable, format: str, toolkit: str) -> str:
+        name = re.sub(r'[^A-Za-z0-9._-]+', '_', f'{toolkit}.{format}')
+        return f'{cls.folder(project.id)}/v{project.content_version}-{name}.zip'
+
+    @classmethod
+    async def open(
+        cls,
+        project: ProjectTable,
+        format: str,
+        toolkit: str,
+        exporter: Exporter,
+    ) -> AsyncIterator[bytes]:
+        """Serve the stored artifact, or build it while streaming and keep it"""
+        key = cls.key(project, format, toolkit)
+        if await SSSRepo.instance.exists(key):
+            logger.info(f'Serving cached export {key}')
+            return SSSRepo.instance.export_stream(key)
+
+        return cls._tee(project, key, exporter.export(project))
+
+    @classmethod
+    async def _tee(
+        cls,
+        project: ProjectTable,
+        key: str,
+        chunks: AsyncIterator[bytes],
+    ) -> AsyncIterator[bytes]:
+        fd, name = tempfile.mkstemp(suffix='.zip')
+        path = Path(name)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                async for chunk in chunks:
+                    await asyncio.to_thread(f.write, chunk)
+                    yield chunk
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+
+        # Upload after the response so the client isn't kept waiting on it
+        cls._spawn(cls._store(project.id, project.content_version, key, path))
+
+    @classmethod
+    async def _store(
+        cls,
+        project_id: UUID,
+        version: int,
+        key: str,
+        path: Path,
+    ) -> None:
+        try:
+            async with ProjectRepo.instance.get_session()() as db:
+                current = await ProjectRepo.instance.get_content_version(db, project_id)
+            if current is None or current > version:
+                logger.info(f'Skipping superseded export {key}')
+                return
+
+            await SSSRepo.instance.upload(path, key, content_type='application/zip')
+            logger.info(f'Stored export {key}')
+
+            # Only older versions, a newer build may have finished first
+            stale = [
+                p for p in await SSSRepo.instance.list(cls.folder(project_id))
+                if (v := cls._version(p)) is not None and v < version
+            ]
+            if stale:
+                await SSSRepo.instance.bulk_delete(stale)
+        finally:
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _version(key: str) -> int | None:
+        match = re.match(r'v(\d+)-', Path(key).name)
+        return int(match.group(1)) if match else None
+
+    @classmethod
+    def schedule(cls, project_id: UUID, user_id: UUID) -> None:
+        """Build every registered export for a freshly completed project"""
+        cls._spawn(cls.materialize(project_id, user_id))
+
+    @classmethod
+    async def materialize(cls, project_id: UUID, user_id: UUID) -> None:
+        async with ProjectRepo.instance.get_session()() as db:
+            project = await ProjectRepo.instance.get_project_by_id(
+                db, project_id, user_id, with_files=True
+            )
+        # Detached from here on, no pooled connection is held while exporting
+        if project is None or project.status != ProcessingStatus.completed:
+            return
+
+        for format, toolkit, exporter in list_exporters():
+            key = cls.key(project, format, toolkit)
+            if await SSSRepo.instance.exists(key):
+                continue
+
+            fd, name = tempfile.mkstemp(suffix='.zip')
+            path = Path(name)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    async for chunk in exporter.export(project):
+                        await asyncio.to_thread(f.write, chunk)
+            except BaseException:
+                path.unlink(missing_ok=True)
+                raise
+            await cls._store(project.id, project.content_version, key, path)
+
+    @classmethod
+    def _spawn(cls, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(cls._run(coro))
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+
+    @staticmethod
+    async def _run(coro: Coroutine[Any, Any, None]) -> None:
+        try:
+            await coro
+        except Exception:
+            logger.error('Export artifact task failed', exc_info=True)
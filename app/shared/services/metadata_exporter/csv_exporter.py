@@ -1,11 +1,10 @@
-from io import BytesIO
+from collections.abc import AsyncIterator
 from typing import Literal
-from zipfile import ZipFile, ZIP_DEFLATED
 
 from app.entities.models.audio_file import AudioFileTable
 from app.entities.models.project import ProjectTable
-from app.entities.repositories.sss.base import SSSRepo
 from app.entities.types.enums.processing_status import ProcessingStatus
+from app.shared.services.metadata_exporter.zip_stream import stream_zip
 
 
 class CSVExporter:
@@ -30,18 +29,11 @@ class CSVExporter:
 
         return (buffer, exported_files)
 
-    async def export(self, project: ProjectTable) -> BytesIO:
-        buffer = BytesIO()
-
+    def export(self, project: ProjectTable) -> AsyncIterator[bytes]:
         metadata, files = self.get_metadata(project)
 
-        with ZipFile(buffer, 'w', ZIP_DEFLATED) as zf:
-            for file in files:
-                data = await SSSRepo.create_instance().download(file.file_path_raw)
-                zf.writestr(f'files/{file.file_name}', data)
-                
-            zf.writestr(f'metadata{self.ext}', metadata)
-            
-        buffer.seek(0)
-        
-        return buffer
\ No newline at end of file
+        return stream_zip(
+            # The upload as-is, under its unique name
+            [(f'files/{file.file_name}', file.file_path_raw) for file in files],
+            [(f'metadata{self.ext}', metadata)],
+        )
@@ -2,25 +2,43 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
+import socket
 from collections.abc import AsyncGenerator, Callable
+from contextlib import suppress
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.exceptions import HTTPException
 
+from app.core.config import Config
+from app.core.logger import get
+from app.entities.models.processing_job import ProcessingJobTable
 from app.entities.models.project import ProjectTable
+from app.entities.repositories.job.base import JobRepo
 from app.entities.repositories.project.base import ProjectRepo
+from app.entities.schemas.events.processing_event import ProcessingEvent
+from app.entities.schemas.events.project_event import ProjectEvent
+from app.entities.types.enums.event_type import EventType
 from app.entities.types.task_log import TaskLog
+from app.shared.services.event_manager import EventManager
 from app.shared.services.project_processor.task import ProcessingTask
 from app.entities.types.enums.processing_status import ProcessingStatus
 
+logger = get()
+
 
 class ProjectProcessor:
     tasks: dict[UUID, ProcessingTask] = {}
+    worker_id: str = f'{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}'
+
+    _runners: dict[UUID, asyncio.Task[None]] = {}
+    _poller: asyncio.Task[None] | None = None
+    _wakeup: asyncio.Event | None = None
 
     @classmethod
-    def start(
+    async def start(
         cls,
         project: ProjectTable,
     ):
@@ -33,46 +51,154 @@ class ProjectProcessor:
                 status_code=400, detail='Project is already processing',
             )
 
-        task = ProcessingTask(cls, project)
+        db = ProjectRepo.instance.get_session()()
+        try:
+            job = await JobRepo.instance.enqueue(db, project)
+            project.status = ProcessingStatus.queued
+            project = await ProjectRepo.instance.replace_project(
+                db, project, project.created_by
+            )
+            EventManager.notify(
+                ProjectEvent.from_table(
+                    project, str(project.created_by), EventType.project_updated
+                )
+            )
+        finally:
+            await db.close()
+
+        logger.info(f'Queued job {job.id} for project {project.id}')
+        if cls._wakeup is not None:
+            cls._wakeup.set()
+
+    @classmethod
+    def _run(cls, project: ProjectTable, job: ProcessingJobTable) -> None:
+        task = ProcessingTask(cls, project, job)
         cls.tasks[project.id] = task
-        
-        asyncio.create_task(task.start())
+        cls._runners[project.id] = asyncio.create_task(task.start())
+
+    @staticmethod
+    def notify_failed(projects: list[ProjectTable]) -> None:
+        """Announce projects whose job was given up on"""
+        for project in projects:
+            logger.warning(f'Processing of project {project.id} failed for good')
+            EventManager.notify(
+                ProjectEvent.from_table(
+                    project, str(project.created_by), EventType.project_updated
+                )
+            )
 
     @classmethod
     def on_task_complete(cls, project_id: UUID) -> None:
         cls.tasks.pop(project_id, None)  # Use pop to avoid KeyError if already removed
+        cls._runners.pop(project_id, None)
+        if cls._wakeup is not None:
+            cls._wakeup.set()
 
     @classmethod
-    def get_stream(cls, project_id: UUID) -> Callable[[], AsyncGenerator[Any, str]]:
-        task = cls.tasks.get(project_id)
-        if task is None:
+    async def get_stream(
+        cls,
+        db: AsyncSession,
+        project_id: UUID,
+    ) -> Callable[[], AsyncGenerator[Any, str]]:
+        job = await JobRepo.instance.get_active_job(db, project_id)
+        if job is None:
             raise HTTPException(
                 404, f'No running tasks for project {project_id}',
             )
 
-        queue = asyncio.Queue[TaskLog]()
-        task.subscribe(queue)
-        last_log: TaskLog | None = None
+        project_id_str = str(project_id)
+        stream = EventManager.get_events(
+            ProcessingEvent,
+            lambda x: x.project_id == project_id_str,
+        )
 
         async def generator():
-            while True:
-                log = await queue.get()
-                yield cls.log_to_json_str(log)
-                if log.stop_connections:
-                    return
+            try:
+                async for event in stream:
+                    yield cls.log_to_json_str(event.to_log())
+                    if event.stop_connections:
+                        return
+            finally:
+                await stream.aclose()
 
         return generator
 
     @classmethod
     def restart(cls) -> None:
-        ...
+        """Start polling the job table, resuming jobs whose lease expired"""
+        if cls._poller is None or cls._poller.done():
+            cls._wakeup = asyncio.Event()
+            cls._poller = asyncio.create_task(cls._poll())
+
+    @classmethod
+    async def exit(cls) -> None:
+        if cls._poller is not None:
+            cls._poller.cancel()
+            with suppress(asyncio.CancelledError):
+                await cls._poller
+            cls._poller = None
+            cls._wakeup = None
+
+        runners = list(cls._runners.values())
+        for runner in runners:
+            runner.cancel()
+        await asyncio.gather(*runners, return_exceptions=True)
+        cls.tasks.clear()
+        cls._runners.clear()
+
+        # Hand our leases back right away instead of waiting for them to expire
+        db = ProjectRepo.instance.get_session()()
+        try:
+            released = await JobRepo.instance.release(db, cls.worker_id)
+        finally:
+            await db.close()
+        if released:
+            logger.warning(f'Released {released} processing job(s) on shutdown')
 
     @classmethod
-    def exit(cls) -> None:
-        ...
+    async def _poll(cls) -> None:
+        while True:
+            try:
+                await cls._lease_jobs()
+            except Exception:
+                logger.error('Processing job poll failed', exc_info=True)
+
+            assert cls._wakeup is not None
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(cls._wakeup.wait(), Config.Jobs.POLL_INTERVAL)
+            cls._wakeup.clear()
+
+    @classmethod
+    async def _lease_jobs(cls) -> None:
+        db = ProjectRepo.instance.get_session()()
+        try:
+            cls.notify_failed(
+                await JobRepo.instance.requeue_expired(db, Config.Jobs.MAX_ATTEMPTS)
+            )
+
+            while len(cls.tasks) < Config.Jobs.MAX_CONCURRENT:
+                job = await JobRepo.instance.lease_next(
+                    db, cls.worker_id, Config.Jobs.LEASE_SECONDS
+                )
+                if job is None:
+                    return
+
+                project = await ProjectRepo.instance.get_project_by_id(
+                    db, job.project_id, job.created_by
+                )
+                if project is None:
+                    await JobRepo.instance.fail(
+                        db, job.id, cls.worker_id, 'Project not found', 0
+                    )
+                    continue
+
+                logger.info(f'Resuming project {project.id} from job {job.id}')
+                cls._run(project, job)
+        finally:
+            await db.close()
 
     @staticmethod
-    async def update_db(db: Session, task: ProcessingTask, user_id: UUID):
+    async def update_db(db: AsyncSession, task: ProcessingTask, user_id: UUID):
         await ProjectRepo.instance.replace_project(db, task.project, user_id)
 
     @staticmethod
@@ -86,6 +212,6 @@ class ProjectProcessor:
             'error': log.error,
             'task_statuses':log.task_statuses
         }
-        
+
         str_data = json.dumps(data, ensure_ascii=False)
         return f'data: {str_data}\n\n'
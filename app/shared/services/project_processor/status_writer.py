@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from uuid import UUID
+
+from app.core.config import Config
+from app.core.logger import get
+from app.entities.models.audio_file import AudioFileTable
+from app.entities.repositories.file.base import AudioFileRepo
+from app.entities.schemas.events.event import SEvent
+from app.shared.services.event_manager import EventManager
+
+logger = get()
+
+
+class StatusWriter:
+    """Write-behind persistence for sub-task status transitions.
+
+    Transitions are coalesced per file, only the latest state is written,
+    and flushed every JOB_STATUS_FLUSH_INTERVAL seconds or once
+    JOB_STATUS_FLUSH_BATCH files are waiting, as a single executemany
+    UPDATE. Flushes are serialized so a file never goes back to an older
+    state, and `close` writes whatever is left before the caller moves on.
+
+    Events describing those states are held back until the flush that
+    persists them commits, so a client refetching on an event never reads
+    an older row, and a crash can't lose a state the client already saw.
+    """
+
+    _pending: dict[UUID, AudioFileTable]
+    _events: list[SEvent]
+    _lock: asyncio.Lock
+    _full: asyncio.Event
+    _loop: asyncio.Task[None] | None
+
+    def __init__(self) -> None:
+        self._pending = {}
+        self._events = []
+        self._lock = asyncio.Lock()
+        self._full = asyncio.Event()
+        self._loop = None
+
+    def start(self) -> None:
+        if self._loop is None or self._loop.done():
+            self._loop = asyncio.create_task(self._run())
+
+    def put(self, file: AudioFileTable, event: SEvent | None = None) -> None:
+        self._pending[file.id] = file
+        if event is not None:
+            self._events.append(event)
+        if len(self._pending) >= Config.Jobs.STATUS_FLUSH_BATCH:
+            self._full.set()
+
+    def notify(self, event: SEvent) -> None:
+        """Emit `event` once everything put so far is committed"""
+        if not self._pending and not self._events and not self._lock.locked():
+            EventManager.notify(event)
+            return
+        self._events.append(event)
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._pending and not self._events:
+                return
+            batch = list(self._pending.values())
+            events = self._events
+            self._pending.clear()
+            self._events = []
+
+            try:
+                if batch:
+                    repo = AudioFileRepo.instance
+                    async with repo.get_session()() as db:
+                        await repo.save_transcriptions(db, batch)
+            except BaseException:
+                # Anything newer for the same file is the same object anyway
+                for file in batch:
+                    self._pending.setdefault(file.id, file)
+                self._events[:0] = events
+                raise
+
+        for event in events:
+            EventManager.notify(event)
+        logger.debug(f"Flushed {len(batch)} file status update(s)")
+
+    async def close(self) -> None:
+        if self._loop is not None:
+            self._loop.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._loop
+            self._loop = None
+        # Events queued behind an in-flight flush need one more round
+        while self._pending or self._events:
+            await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._full.wait(), Config.Jobs.STATUS_FLUSH_INTERVAL
+                )
+            self._full.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.error("Status flush failed, retrying", exc_info=True)
@@ -5,28 +5,30 @@ from logging import Logger
 from typing import Any, override
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+import httpx
 
 from app.core.logger import get as get_logger
 from app.entities.models.audio_file import AudioFileTable
-from app.entities.repositories.sss.base import SSSRepo
-from app.entities.repositories.stt.base import STTRepo
 from app.entities.schemas.events.audio_file_event import AudioFileEvent
 from app.entities.types.enums.event_type import EventType
 from app.entities.types.enums.processing_status import ProcessingStatus
 from app.entities.types.task_log import SubTaskLog
 from app.entities.types.transcription_result import TranscriptionResult
-from app.shared.services.event_manager import EventManager
+from app.shared.services.file_urls import FileURLs
+from app.shared.services.project_processor.status_writer import StatusWriter
+from app.shared.services.segmenter import transcribe_stored
+from app.shared.services.transcription_cache import TranscriptionCache
 
 
 class SubTask:
     file: AudioFileTable
-    db: Session
+    writer: StatusWriter
 
     listener: Callable[[SubTaskLog, SubTask], Coroutine[Any, Any, None]] | None = None
 
     _status: ProcessingStatus
     _content: str | None
+    _model: str | None
     _progress: float | None = None
     _error_msg: str | None = None
 
@@ -38,9 +40,9 @@ class SubTask:
     def id(self) -> UUID:
         return self.file.id
 
-    def __init__(self, db: Session, file: AudioFileTable) -> None:
+    def __init__(self, file: AudioFileTable, writer: StatusWriter) -> None:
         self.file = file
-        self.db = db
+        self.writer = writer
         self._load()
         self.logger = get_logger()
 
@@ -71,12 +73,15 @@ class SubTask:
     def _load(self) -> None:
         self._status = self.file.transcription_status
         self._content = self.file.transcription_content
+        self._model = self.file.transcription_model
         self._progress = None  # Unimplemented
 
-    def commit(self) -> None:
+    async def commit(self) -> None:
         self.file.transcription_status = self._status
         self.file.transcription_content = self._content
-        
+        self.file.transcription_model = self._model
+        self.file.error_message = self._error_msg
+
         # Construct eid as user_id + project_id to match SSE filter
         eid = str(self.file.created_by) + str(self.file.project_id)
         
@@ -84,32 +89,30 @@ class SubTask:
             self.file,
             eid,
             EventType.file_updated,
-            SSSRepo.create_instance().get_public_url(self.file.file_path_raw),
+            await FileURLs.get(self.file.file_path_raw),
         )
-        self.logger.info(f"Emitting file_updated event for file {self.file.id}, status={self._status}, eid={eid}")
-        EventManager.notify(event)
-        self.db.merge(self.file)
-        self.db.flush()  # Flush changes to database immediately
-        self.db.commit()  # CRITICAL: Actually save to database!
+        self.logger.info(f"Queued file_updated event for file {self.file.id}, status={self._status}, eid={eid}")
+        # Persisted in bulk by the task's writer, the event follows the commit
+        self.writer.put(self.file, event)
 
-    async def start(self) -> None:
+    async def begin(self) -> None:
         if self._status not in (ProcessingStatus.pending, ProcessingStatus.queued):
             raise RuntimeError(f"Cannot process already started file {self.id}")
 
         self._status = ProcessingStatus.processing
         
         # Emit event immediately so UI shows "processing" status
-        self.commit()
+        await self.commit()
         
         await self._log(f"File {self.file.file_name} started")
 
-        self.result = await STTRepo.instance.transcribe_from_sss_path(
-            self.file.file_path_raw
-        )
+    async def _apply(self, result: TranscriptionResult) -> None:
+        self.result = result
 
         if self.result.status_code == 201:
             self._status = ProcessingStatus.completed
             self._content = self.result.transcription
+            self._model = self.result.model_used
             await self._log(f"File {self.file.file_name} finished")
 
         else:
@@ -121,8 +124,48 @@ class SubTask:
                 f"File {self.file.file_name} failed", code=self.result.status_code
             )
 
-    def _save_to_db(self) -> None:
-        self.db.commit()
+    async def fail(self, e: Exception) -> None:
+        # One slow or failing file must not take the whole project down
+        self._status = ProcessingStatus.error
+        self._progress = None
+        self._error_msg = f"ASR request failed: {type(e).__name__}"
+        if isinstance(e, httpx.HTTPStatusError):
+            code = e.response.status_code
+        elif isinstance(e, httpx.TimeoutException):
+            code = 504
+        elif isinstance(e, httpx.HTTPError):
+            code = 502
+        else:
+            code = 500
+        await self._err(f"File {self.file.file_name} failed", code=code)
+
+    async def cached_result(self) -> TranscriptionResult | None:
+        return await TranscriptionCache.get(self.file.content_hash)
+
+    async def finish(self, result: TranscriptionResult) -> None:
+        TranscriptionCache.put(self.file.content_hash, result)
+        await self._apply(result)
+
+    async def start(self) -> None:
+        await self.begin()
+
+        cached = await self.cached_result()
+        if cached is not None:
+            await self._apply(cached)
+            return
+
+        try:
+            result = await transcribe_stored(
+                self.file.audio_path,
+                self.file.created_by,
+                self.file.project_id,
+                self.file.duration,
+            )
+        except (httpx.HTTPError, RuntimeError) as e:
+            await self.fail(e)
+            return
+
+        await self.finish(result)
 
     @override
     def __eq__(self, value: object) -> bool:
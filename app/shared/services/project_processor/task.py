@@ -3,24 +3,33 @@ from __future__ import annotations
 import asyncio
 import time
 from collections.abc import Coroutine
-from contextlib import suppress
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.core.config import Config
 from app.core.logger import get
+from app.entities.models.processing_job import ProcessingJobTable
 from app.entities.models.project import ProjectTable
+from app.entities.repositories.job.base import JobRepo
 from app.entities.repositories.project.base import ProjectRepo
+from app.entities.repositories.stt.base import STTRepo
+from app.entities.schemas.events.processing_event import ProcessingEvent
 from app.entities.schemas.events.project_event import ProjectEvent
 from app.entities.types.enums.event_type import EventType
 from app.entities.types.enums.processing_status import ProcessingStatus
 from app.entities.types.task_log import ChangedFileStatusT, SubTaskLog, TaskLog
+from app.shared.services.asr_scheduler import ASRScheduler
 from app.shared.services.event_manager import EventManager
+from app.shared.services.metadata_exporter.artifacts import ExportArtifacts
+from app.shared.services.project_processor.status_writer import StatusWriter
 from app.shared.services.project_processor.sub_task import SubTask
+from app.shared.services.segmenter import should_segment
 
 if TYPE_CHECKING:
     from . import ProjectProcessor
-    from .sub_task import SubTask
 
 
 logger = get()
@@ -28,30 +37,30 @@ logger = get()
 
 class ProcessingTask:
     project: ProjectTable
+    job: ProcessingJobTable
     sub_tasks: dict[SubTask, ProcessingStatus]
     changes: list[ChangedFileStatusT]
+    writer: StatusWriter
 
-    _listeners: list[asyncio.Queue[TaskLog]]
     _manager: type[ProjectProcessor]
 
     @property
     def id(self) -> UUID:
         return self.project.id
 
-    def __init__(self, manager: type[ProjectProcessor], project: ProjectTable) -> None:
+    def __init__(
+        self,
+        manager: type[ProjectProcessor],
+        project: ProjectTable,
+        job: ProcessingJobTable,
+    ) -> None:
         self.project = project
+        self.job = job
         self.sub_tasks = {}
         self.changes = []
-        self._listeners = []
+        self.writer = StatusWriter()
         self._manager = manager
 
-    def subscribe(self, queue: asyncio.Queue[TaskLog]) -> None:
-        self._listeners.append(queue)
-
-    def unsubscribe(self, queue: asyncio.Queue[TaskLog]) -> None:
-        with suppress(ValueError):
-            self._listeners.remove(queue)
-
     _is_waiting: bool = False
 
     async def update_sub_task(self, st: SubTask) -> None:
@@ -72,7 +81,6 @@ class ProcessingTask:
         self._is_waiting = False
         updates = self.changes.copy()
         self.changes.clear()
-        queues = self._listeners.copy()
 
         tasks_len = len(self.sub_tasks)
         completed_len = 0
@@ -93,8 +101,9 @@ class ProcessingTask:
             stop_connections=stop_connections,
         )
 
-        for q in queues:
-            await q.put(log)
+        # Published through the event bus so streams on any web process see
+        # it, once the writer has persisted the states it reports
+        self.writer.notify(ProcessingEvent.from_log(log))
 
     async def _on_sub_task_update(self, log: SubTaskLog, task: SubTask) -> None:
         self.sub_tasks[task] = log.status
@@ -103,33 +112,182 @@ class ProcessingTask:
 
     async def _run_task(self, task: SubTask) -> SubTask:
         t0 = time.perf_counter()
+        await task.start()
+        logger.debug(
+            f"Transcription for file {task.id} finished (took {(time.perf_counter() - t0):.4f}s)"
+        )
+        # Commit immediately to emit SSE event for real-time UI update
+        await task.commit()
+        return task
+
+    async def _run_batch(self, batch: list[SubTask]) -> list[SubTask]:
+        if len(batch) == 1:
+            return [await self._run_task(batch[0])]
+
+        t0 = time.perf_counter()
+        misses: list[SubTask] = []
+        for st in batch:
+            await st.begin()
+            cached = await st.cached_result()
+            if cached is None:
+                misses.append(st)
+                continue
+            await st.finish(cached)
+            await st.commit()
+
+        if not misses:
+            return batch
+
+        first = misses[0].file
         try:
-            await task.start()
-            logger.debug(
-                f"Transcription for file {task.id} finished (took {(time.perf_counter() - t0):.4f}s)"
-            )
-            # Commit immediately to emit SSE event for real-time UI update
-            task.commit()
-            return task
-        finally:
-            # Close the session to prevent connection leaks
-            task.db.close()
+            async with ASRScheduler.slot(
+                str(first.created_by), str(first.project_id)
+            ):
+                results = await STTRepo.instance.transcribe_batch(
+                    [st.file.audio_path for st in misses]
+                )
+            if len(results) != len(misses):
+                raise ValueError(
+                    f"Expected {len(misses)} batch results, got {len(results)}"
+                )
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"Batch of {len(misses)} files failed: {e!r}")
+            for st in misses:
+                await st.fail(e)
+                await st.commit()
+            return batch
+
+        for st, result in zip(misses, results):
+            await st.finish(result)
+            await st.commit()
+
+        logger.debug(
+            f"Transcription for batch of {len(batch)} files finished "
+            f"(took {(time.perf_counter() - t0):.4f}s)"
+        )
+        return batch
+
+    @staticmethod
+    def _batches(runnable: list[SubTask]) -> list[list[SubTask]]:
+        """Group short files up to ASR_BATCH_MAX_FILES / ASR_BATCH_MAX_DURATION_MS.
+
+        Files the segmenter would split are never batched.
+        """
+        max_files = Config.ASR_BATCH_MAX_FILES
+        max_duration = Config.ASR_BATCH_MAX_DURATION_MS
+        batches: list[list[SubTask]] = []
+        current: list[SubTask] = []
+        duration = 0
+
+        for st in runnable:
+            file_duration = st.file.duration
+            # Long files go alone, through the segmenting path of SubTask.start
+            if (
+                max_files <= 1
+                or file_duration is None
+                or file_duration > max_duration
+                or should_segment(file_duration)
+            ):
+                batches.append([st])
+                continue
+
+            if current and (
+                len(current) >= max_files or duration + file_duration > max_duration
+            ):
+                batches.append(current)
+                current = []
+                duration = 0
+
+            current.append(st)
+            duration += file_duration
+
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _heartbeat(self, runner: asyncio.Task[Any]) -> None:
+        while True:
+            await asyncio.sleep(Config.Jobs.HEARTBEAT_INTERVAL)
+            db = ProjectRepo.instance.get_session()()
+            try:
+                alive = await JobRepo.instance.heartbeat(
+                    db,
+                    self.job.id,
+                    self._manager.worker_id,
+                    Config.Jobs.LEASE_SECONDS,
+                )
+            except Exception:
+                logger.warning(f"Heartbeat failed for job {self.job.id}", exc_info=True)
+                continue
+            finally:
+                await db.close()
+
+            if not alive:
+                logger.warning(
+                    f"Lost lease on job {self.job.id}, stopping project {self.id}"
+                )
+                runner.cancel()
+                return
 
     async def start(self) -> None:
+        runner = asyncio.current_task()
+        assert runner is not None
+        heartbeat = asyncio.create_task(self._heartbeat(runner))
         db = ProjectRepo.instance.get_session()()
+
+        try:
+            await self._process(db)
+        except asyncio.CancelledError:
+            # Shutdown or lost lease, the job is picked up again elsewhere
+            raise
+        except Exception as e:
+            logger.error(f"Processing failed for project {self.id}", exc_info=True)
+            await db.rollback()
+            failed = await JobRepo.instance.fail(
+                db,
+                self.job.id,
+                self._manager.worker_id,
+                repr(e),
+                Config.Jobs.MAX_ATTEMPTS,
+            )
+            if failed is not None:
+                self._manager.notify_failed([failed])
+        finally:
+            heartbeat.cancel()
+            try:
+                # Keep whatever progress was made for the next attempt
+                await self.writer.close()
+            except Exception:
+                logger.error(
+                    f"Could not persist file statuses for project {self.id}",
+                    exc_info=True,
+                )
+            await db.close()
+            self._manager.on_task_complete(self.id)
+
+    async def _process(self, db: AsyncSession) -> None:
         project = await ProjectRepo.instance.get_project_or_404(
-            db, self.project.id, self.project.created_by
+            db, self.project.id, self.project.created_by, with_files=True
         )
-        if project.status != ProcessingStatus.pending:
+        if project.status not in (
+            ProcessingStatus.pending,
+            ProcessingStatus.queued,
+            ProcessingStatus.processing,
+        ):
             msg = (
                 f"Cannot start non-pending project {project.id}. "
                 f"(current {project.status})"
             )
             raise RuntimeError(msg)
 
+        # A project left in processing was interrupted, pick it up where it stopped
+        resumed = project.status == ProcessingStatus.processing
+
         t0 = time.perf_counter()
-        logger.info(f"Processing started for project {self.project.id}")
-        await self._notify_listeners("Started")
+        logger.info(
+            f"Processing {'resumed' if resumed else 'started'} for project {self.project.id}"
+        )
+        await self._notify_listeners("Resumed" if resumed else "Started")
 
         # Process files in natural database order
         files = project.files
@@ -144,41 +302,59 @@ class ProcessingTask:
             )
         )
 
-        # Mark all pending files as "queued" to show they're in the processing queue
+        # Files are persisted through the writer from here on, not this session
+        db.expunge_all()
+        self.writer.start()
+
+        # Mark all pending files as "queued" to show they're in the processing queue.
+        # On resume, everything that did not complete goes back in the queue.
         for file in files:
-            if file.transcription_status == ProcessingStatus.pending:
+            if file.transcription_status == ProcessingStatus.pending or (
+                resumed and file.transcription_status != ProcessingStatus.completed
+            ):
                 file.transcription_status = ProcessingStatus.queued
-                db.merge(file)
-        db.commit()  # Commit all queued status updates at once
+                self.writer.put(file)
+        await self.writer.flush()  # All queued status updates in one statement
 
         for file in files:
-            # Create a new session for each SubTask to avoid transaction conflicts
-            file_db = ProjectRepo.instance.get_session()()
-            t = SubTask(file_db, file)
+            t = SubTask(file, self.writer)
             t.listener = self._on_sub_task_update
             self.sub_tasks[t] = file.transcription_status
 
         sem = asyncio.Semaphore(Config.MAX_TASKS_PER_PROJECT)
-        tasks: list[Coroutine[Any, Any, SubTask]] = []
+        runnable: list[SubTask] = []
 
-        async def run_limited(st: SubTask) -> SubTask:
+        async def run_limited(batch: list[SubTask]) -> list[SubTask]:
             async with sem:
-                return await self._run_task(st)
+                return await self._run_batch(batch)
 
         for st, status in self.sub_tasks.items():
             if status in (ProcessingStatus.pending, ProcessingStatus.queued):
-                tasks.append(run_limited(st))
+                runnable.append(st)
+
+        if resumed:
+            logger.info(
+                f"Skipping {len(self.sub_tasks) - len(runnable)} finished file(s) "
+                f"for project {self.id}"
+            )
+
+        tasks: list[Coroutine[Any, Any, list[SubTask]]] = [
+            run_limited(batch) for batch in self._batches(runnable)
+        ]
 
-        results = await asyncio.gather(*tasks)
+        await asyncio.gather(*tasks)
+        # Every file status is durable before the project reads as completed
+        await self.writer.close()
         self.project.status = ProcessingStatus.completed
+        self.project.content_version = project.content_version + 1
 
         # Files are already committed in _run_task, no need to commit again
 
         await ProjectRepo.instance.replace_project(
             db, self.project, self.project.created_by
         )
+        await JobRepo.instance.complete(db, self.job.id, self._manager.worker_id)
 
-        self._manager.on_task_complete(self.id)
         await self._notify_listeners("Finished", stop_connections=True)
         logger.info(
             f"Transcription finished for project {self.id} "
@@ -189,3 +365,5 @@ class ProcessingTask:
                 self.project, str(self.project.created_by), EventType.project_updated
             )
         )
+        if Config.EXPORT_MATERIALIZE:
+            ExportArtifacts.schedule(self.project.id, self.project.created_by)
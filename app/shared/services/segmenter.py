@@ -0,0 +1,175 @@
+import asyncio
+import re
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from uuid import UUID
+
+from app.core.config import Config
+from app.core.logger import get
+from app.entities.repositories.sss.base import SSSRepo
+from app.entities.repositories.stt.base import STTRepo
+from app.entities.types.transcription_result import TranscriptionResult
+from app.shared.services.asr_scheduler import ASRScheduler
+
+logger = get()
+
+_SILENCE_START = re.compile(r'silence_start: (-?[\d.]+)')
+_SILENCE_END = re.compile(r'silence_end: (-?[\d.]+)')
+
+
+def should_segment(duration_ms: int | None) -> bool:
+    return (
+        Config.Segment.ENABLED
+        and duration_ms is not None
+        and duration_ms > Config.Segment.MAX_CHUNK_MS
+    )
+
+
+async def transcribe_local(
+    path: Path,
+    user_id: UUID | str,
+    project_id: UUID | str,
+    duration_ms: int | None = None,
+) -> TranscriptionResult:
+    """Transcribe a local file, splitting it at silences first if it is long"""
+    if not should_segment(duration_ms):
+        async with ASRScheduler.slot(str(user_id), str(project_id)):
+            return await STTRepo.instance.transcribe_from_local_path(path)
+
+    t0 = time.perf_counter()
+    with TemporaryDirectory() as tmp:
+        chunks = await split_at_silences(path, Path(tmp), duration_ms or 0)
+
+        async def transcribe(chunk: Path) -> TranscriptionResult:
+            async with ASRScheduler.slot(str(user_id), str(project_id)):
+                return await STTRepo.instance.transcribe_from_local_path(chunk)
+
+        results = await asyncio.gather(*(transcribe(chunk) for chunk in chunks))
+
+    logger.info(
+        f'Transcribed "{path.name}" as {len(chunks)} segment(s) ({(time.perf_counter() - t0):.4f}s)'
+    )
+    return stitch(path.name, results)
+
+
+async def transcribe_stored(
+    sss_path: str,
+    user_id: UUID | str,
+    project_id: UUID | str,
+    duration_ms: int | None = None,
+) -> TranscriptionResult:
+    """Same as `transcribe_local` for audio that only lives in storage"""
+    if not should_segment(duration_ms):
+        async with ASRScheduler.slot(str(user_id), str(project_id)):
+            return await STTRepo.instance.transcribe_from_sss_path(sss_path)
+
+    with TemporaryDirectory() as tmp:
+        local = await SSSRepo.instance.download_to(
+            sss_path, Path(tmp) / Path(sss_path).name
+        )
+        return await transcribe_local(local, user_id, project_id, duration_ms)
+
+
+def stitch(name: str, results: list[TranscriptionResult]) -> TranscriptionResult:
+    failed = next((r for r in results if r.status_code != 201), None)
+    if not results:
+        # Nothing was transcribed, an empty text must not pass as a result
+        status_code = 500
+    else:
+        status_code = failed.status_code if failed else 201
+    return TranscriptionResult(
+        status_code=status_code,
+        transcription=' '.join(
+            text for r in results if (text := r.transcription.strip())
+        ),
+        audio_filename=name,
+        model_used=results[0].model_used if results else '',
+    )
+
+
+async def split_at_silences(path: Path, out_dir: Path, duration_ms: int) -> list[Path]:
+    silences = await detect_silences(path)
+    cuts = plan_cuts(
+        duration_ms,
+        silences,
+        Config.Segment.MAX_CHUNK_MS,
+        Config.Segment.MIN_CHUNK_MS,
+    )
+    if not cuts:
+        return [path]
+
+    # One pass with the segment muxer; pcm is copied so cuts are near sample exact
+    process = await asyncio.create_subprocess_exec(
+        'ffmpeg', '-y', '-v', 'error', '-i', str(path),
+        '-f', 'segment',
+        '-segment_times', ','.join(f'{cut / 1000:.3f}' for cut in cuts),
+        '-reset_timestamps', '1',
+        '-c', 'copy',
+        # Fixed names, the upload's stem may hold glob characters like [ or *
+        str(out_dir / 'chunk_%04d.wav'),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        logger.warning(stderr.decode())
+        raise RuntimeError(f'Failed to segment {path}')
+
+    chunks = sorted(out_dir.glob('chunk_*.wav'))
+    if not chunks:
+        raise RuntimeError(f'Segmenting {path} produced no chunks')
+    return chunks
+
+
+async def detect_silences(path: Path) -> list[tuple[int, int]]:
+    """(start_ms, end_ms) of every silence ffmpeg's silencedetect finds"""
+    process = await asyncio.create_subprocess_exec(
+        'ffmpeg', '-hide_banner', '-nostats', '-i', str(path),
+        '-af', (
+            f'silencedetect=noise={Config.Segment.SILENCE_THRESHOLD_DB}dB'
+            f':d={Config.Segment.MIN_SILENCE_MS / 1000}'
+        ),
+        '-f', 'null', '-',
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        logger.warning(stderr.decode())
+        raise RuntimeError(f'Failed to detect silences in {path}')
+
+    silences: list[tuple[int, int]] = []
+    start: int | None = None
+    for line in stderr.decode().splitlines():
+        if m := _SILENCE_START.search(line):
+            start = max(0, int(float(m.group(1)) * 1000))
+        elif (m := _SILENCE_END.search(line)) and start is not None:
+            silences.append((start, int(float(m.group(1)) * 1000)))
+            start = None
+    return silences
+
+
+def plan_cuts(
+    duration_ms: int,
+    silences: list[tuple[int, int]],
+    max_chunk_ms: int,
+    min_chunk_ms: int,
+) -> list[int]:
+    """Cut points so that no chunk is longer than `max_chunk_ms`.
+
+    Each cut goes in the middle of the latest silence that keeps the chunk
+    under the limit, falling back to a hard cut when a stretch of speech is
+    longer than the limit.
+    """
+    midpoints = [(start + end) // 2 for start, end in silences]
+    cuts: list[int] = []
+    pos = 0
+
+    while duration_ms - pos > max_chunk_ms:
+        limit = pos + max_chunk_ms
+        candidates = [m for m in midpoints if pos + min_chunk_ms <= m <= limit]
+        pos = candidates[-1] if candidates else limit
+        cuts.append(pos)
+
+    return cuts
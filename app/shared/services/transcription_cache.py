@@ -0,0 +1,129 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import Config
+from app.core.logger import get
+from app.entities.repositories.file.base import AudioFileRepo
+from app.entities.types.transcription_result import TranscriptionResult
+
+logger = get()
+
+
+class TranscriptionCache:
+    """Transcriptions reused across identical audio, keyed by content hash and model.
+
+    The source of truth is audio_files: any completed row with the same
+    content_hash and transcription_model, so hits survive restarts and are
+    shared between workers. An in-process LRU + TTL sits in front of it to
+    spare the query for hot duplicates, TRANSCRIPTION_CACHE_SIZE=0 turns it off.
+
+    Lookups use the model the ASR service last reported (or ASR_MODEL when
+    set), so switching models on the ASR side simply starts missing.
+    """
+
+    max_size: int = Config.TranscriptionCache.SIZE
+    ttl: float = Config.TranscriptionCache.TTL
+    model: str | None = Config.ASR_MODEL or None
+
+    _entries: OrderedDict[tuple[str, str], tuple[TranscriptionResult, float]] = (
+        OrderedDict()
+    )
+    _hits: int = 0
+    _db_hits: int = 0
+    _misses: int = 0
+    _evictions: int = 0
+
+    @classmethod
+    async def get(cls, content_hash: str | None) -> TranscriptionResult | None:
+        if content_hash is None or cls.model is None:
+            return None
+
+        key = (content_hash, cls.model)
+        result = cls._get_local(key)
+        if result is not None:
+            cls._hits += 1
+            return result
+
+        result = await cls._get_stored(*key)
+        if result is None:
+            cls._misses += 1
+            return None
+
+        cls._db_hits += 1
+        cls._put_local(key, result)
+        return result
+
+    @classmethod
+    def put(cls, content_hash: str | None, result: TranscriptionResult) -> None:
+        """Remember a fresh result, the row itself is persisted by the caller"""
+        if result.status_code != 201:
+            return
+        if not Config.ASR_MODEL:
+            cls.model = result.model_used
+        if content_hash is None:
+            return
+
+        cls._put_local((content_hash, result.model_used), result)
+
+    @classmethod
+    def _get_local(cls, key: tuple[str, str]) -> TranscriptionResult | None:
+        entry = cls._entries.get(key)
+        if entry is None:
+            return None
+
+        result, expires_at = entry
+        if expires_at < time.monotonic():
+            del cls._entries[key]
+            cls._evictions += 1
+            return None
+
+        cls._entries.move_to_end(key)
+        return result
+
+    @classmethod
+    def _put_local(cls, key: tuple[str, str], result: TranscriptionResult) -> None:
+        if cls.max_size <= 0:
+            return
+
+        cls._entries[key] = (result, time.monotonic() + cls.ttl)
+        cls._entries.move_to_end(key)
+        while len(cls._entries) > cls.max_size:
+            cls._entries.popitem(last=False)
+            cls._evictions += 1
+
+    @staticmethod
+    async def _get_stored(content_hash: str, model: str) -> TranscriptionResult | None:
+        repo = AudioFileRepo.instance
+        try:
+            async with repo.get_session()() as db:
+                file = await repo.find_transcription(db, content_hash, model)
+        except SQLAlchemyError as e:
+            # A cache miss costs one ASR call, not the file
+            logger.warning(f'Transcription lookup failed: {e!r}')
+            return None
+
+        if file is None or file.transcription_content is None:
+            return None
+        return TranscriptionResult(
+            status_code=201,
+            transcription=file.transcription_content,
+            audio_filename=file.file_name,
+            model_used=model,
+        )
+
+    @classmethod
+    def stats(cls) -> dict[str, Any]:
+        lookups = cls._hits + cls._db_hits + cls._misses
+        return {
+            'size': len(cls._entries),
+            'max_size': cls.max_size,
+            'model': cls.model,
+            'hits': cls._hits,
+            'db_hits': cls._db_hits,
+            'misses': cls._misses,
+            'hit_rate': (cls._hits + cls._db_hits) / lookups if lookups else 0.0,
+            'evictions': cls._evictions,
+        }
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from pathlib import Path
+
+from app.core.config import Config
+from app.core.logger import get as get_logger
+from app.shared.utils.probe import read_wav_header
+
+logger = get_logger()
+
+
+def _filters() -> list[str]:
+    filters: list[str] = []
+    if Config.Audio.TRIM_SILENCE:
+        # silenceremove only trims the start reliably, so trim, flip, trim, flip back.
+        # areverse holds the whole decoded stream in memory, before resampling
+        # (~1.4 GB per hour of 48 kHz stereo), which bounds usable upload length
+        trim = (
+            'silenceremove=start_periods=1:start_silence=0.1'
+            f':start_threshold={Config.Audio.SILENCE_THRESHOLD_DB}dB'
+        )
+        filters += [trim, 'areverse', trim, 'areverse']
+    if Config.Audio.LOUDNORM:
+        filters.append('loudnorm=I=-16:TP=-1.5:LRA=11')
+    return filters
+
+
+async def matches_profile(path: Path) -> bool:
+    """Whether `path` is a WAV already in the ASR profile, with nothing to filter"""
+    if _filters():
+        return False
+    info = await asyncio.to_thread(read_wav_header, path)
+    return info is not None and (
+        info.codec == Config.Audio.CODEC
+        and (not Config.Audio.SAMPLE_RATE or info.sample_rate == Config.Audio.SAMPLE_RATE)
+        and (not Config.Audio.CHANNELS or info.channels == Config.Audio.CHANNELS)
+    )
+
+
+async def normalize_audio(path: Path, output_path: Path) -> Path:
+    """Transcode `path` to the configured ASR profile in a single ffmpeg pass.
+
+    Returns `path` itself when it already matches the profile, callers then
+    store a single object and point the cleaned path at the upload.
+    """
+    t0 = time.perf_counter()
+    if await matches_profile(path):
+        logger.info(f'"{path.name}" already matches the audio profile, not converted')
+        return path
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    args = ['ffmpeg', '-y', '-v', 'error', '-i', str(path), '-vn', '-map_metadata', '-1']
+    if filters := _filters():
+        args += ['-af', ','.join(filters)]
+    if Config.Audio.SAMPLE_RATE:
+        args += ['-ar', str(Config.Audio.SAMPLE_RATE)]
+    if Config.Audio.CHANNELS:
+        args += ['-ac', str(Config.Audio.CHANNELS)]
+    args += ['-c:a', Config.Audio.CODEC, str(output_path)]
+
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        logger.warning(stderr.decode())
+        raise RuntimeError(f'Failed to normalize {path}')
+
+    logger.info(f'Normalized "{path.name}" to "{output_path.name}" ({(time.perf_counter() - t0):.4f}s)')
+    return output_path
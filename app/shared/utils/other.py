@@ -1,11 +1,14 @@
 import asyncio
+import hashlib
+import mimetypes
 from math import ceil
 import os
 from collections.abc import Callable
 from pathlib import Path
-import time
 import re
 
+from fastapi import HTTPException, UploadFile, status
+
 from app.entities.types.pagination import Paginated
 from app.core.logger import get as get_logger
 
@@ -35,6 +38,9 @@ def optional_env[T](key: str, default: T) -> T:
     if value is None or value.strip() == '':
         return default
 
+    if isinstance(default, bool):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')  # type: ignore
+
     cls = type(default)
     return cls(value) # type: ignore
 
@@ -53,30 +59,48 @@ def paginate[T](data: list[T], skip: int = 0, limit: int = 100) -> Paginated[T]:
             'page': current_page,
             'total_pages': total_pages,
             'total_items': total_items,
+            'next_cursor': None,
         }
     }
 
 
-async def convert_to_wav(path: Path) -> Path:
-        if path.name.endswith('.wav'):
-            logger.debug('Already a wav file, ignored.')
-            return path
-        
-        output_path = path.with_suffix('wav')
-        t0 = time.perf_counter()
-        
-        process = await asyncio.create_subprocess_exec(
-            'ffmpeg', '-y', '-i', str(path), str(output_path),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+async def hash_file(path: Path) -> str:
+    def digest() -> str:
+        with path.open('rb') as f:
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+
+    return await asyncio.to_thread(digest)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def save_upload(file: UploadFile, dest: Path, max_bytes: int) -> int:
+    """Stream an upload to disk chunk by chunk, rejecting it past `max_bytes`"""
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(
+            status.HTTP_413_CONTENT_TOO_LARGE,
+            f'"{file.filename}" exceeds the {max_bytes:_} byte upload limit',
         )
-        stdout, stderr = await process.communicate()
-        if process.returncode != 0:
-            logger.warning(stderr.decode())
-            raise RuntimeError(f'Failed to convert {path}')
-        
-        logger.info(f'Converted "{path.name}" to "{output_path.name}" ({(time.perf_counter() - t0):.4f}s)')
-        return output_path
+
+    written = 0
+    try:
+        with dest.open('wb') as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise HTTPException(
+                        status.HTTP_413_CONTENT_TOO_LARGE,
+                        f'"{file.filename}" exceeds the {max_bytes:_} byte upload limit',
+                    )
+                await asyncio.to_thread(f.write, chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+
+    return written
+
+def audio_content_type(path: Path) -> str:
+    return mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
 
 def bump_name(name: str, step: int = 1) -> str:
     m = re.search(r"(\d+)$", name)
@@ -86,3 +110,15 @@ def bump_name(name: str, step: int = 1) -> str:
     new = int(num) + step
     width = len(num)
     return f"{name[:m.start()]}{str(new).zfill(width)}"
+
+
+def unique_file_name(file_name: str, taken: set[str]) -> str:
+    """`file_name`, its stem bumped until it is not in `taken`, then claimed"""
+    path = Path(file_name)
+    stem = path.stem
+    candidate = file_name
+    while candidate in taken:
+        stem = bump_name(stem)
+        candidate = f"{stem}{path.suffix}"
+    taken.add(candidate)
+    return candidate
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import struct
+import time
+from pathlib import Path
+
+from app.core.logger import get as get_logger
+from app.entities.types.audio_info import AudioInfo
+
+logger = get_logger()
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_ALAW = 0x0006
+_WAVE_FORMAT_MULAW = 0x0007
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+async def probe(path: Path) -> AudioInfo:
+    """Read duration, sample rate, channels and codec without decoding samples.
+
+    WAV files are read from their RIFF header, anything else (or a WAV we
+    can't make sense of) goes through a single ffprobe call.
+    """
+    t0 = time.perf_counter()
+    info = await asyncio.to_thread(read_wav_header, path)
+    if info is None:
+        info = await ffprobe(path)
+    logger.debug(f'Probed "{path.name}": {info} ({(time.perf_counter() - t0):.4f}s)')
+    return info
+
+
+def read_wav_header(path: Path) -> AudioInfo | None:
+    with path.open('rb') as f:
+        head = f.read(12)
+        if len(head) < 12 or head[:4] not in (b'RIFF', b'RF64') or head[8:12] != b'WAVE':
+            return None
+
+        fmt: bytes | None = None
+        data_size: int | None = None
+        ds64_data_size: int | None = None
+
+        while chunk := f.read(8):
+            if len(chunk) < 8:
+                break
+            chunk_id, size = struct.unpack('<4sI', chunk)
+
+            if chunk_id == b'data':
+                if size == 0xFFFFFFFF and ds64_data_size is not None:
+                    size = ds64_data_size
+                # Streamed writers leave the size unset, trust the file instead
+                remaining = path.stat().st_size - f.tell()
+                data_size = min(size, remaining)
+                break
+
+            if chunk_id == b'fmt ':
+                fmt = f.read(size)
+            elif chunk_id == b'ds64':
+                body = f.read(size)
+                if len(body) >= 16:
+                    ds64_data_size = struct.unpack_from('<Q', body, 8)[0]
+            else:
+                f.seek(size, 1)
+
+            if size % 2:
+                f.seek(1, 1)
+
+    if fmt is None or len(fmt) < 16 or data_size is None:
+        return None
+
+    tag, channels, sample_rate, byte_rate, _, bits = struct.unpack_from('<HHIIHH', fmt)
+    if tag == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        tag = struct.unpack_from('<H', fmt, 24)[0]
+
+    codec = _wav_codec(tag, bits)
+    if codec is None or not byte_rate:
+        return None
+
+    return AudioInfo(
+        duration_ms=data_size * 1000 // byte_rate,
+        sample_rate=sample_rate,
+        channels=channels,
+        codec=codec,
+    )
+
+
+def _wav_codec(tag: int, bits: int) -> str | None:
+    if tag == _WAVE_FORMAT_PCM:
+        return 'pcm_u8' if bits == 8 else f'pcm_s{bits}le'
+    if tag == _WAVE_FORMAT_IEEE_FLOAT:
+        return f'pcm_f{bits}le'
+    if tag == _WAVE_FORMAT_ALAW:
+        return 'pcm_alaw'
+    if tag == _WAVE_FORMAT_MULAW:
+        return 'pcm_mulaw'
+    return None
+
+
+async def ffprobe(path: Path) -> AudioInfo:
+    process = await asyncio.create_subprocess_exec(
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'a:0',
+        '-show_entries', 'stream=codec_name,sample_rate,channels,duration:format=duration',
+        '-of', 'json',
+        str(path),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        logger.warning(stderr.decode())
+        raise RuntimeError(f'Failed to probe {path}')
+
+    data = json.loads(stdout or b'{}')
+    stream = (data.get('streams') or [{}])[0]
+    duration = stream.get('duration') or data.get('format', {}).get('duration')
+
+    return AudioInfo(
+        duration_ms=int(float(duration) * 1000) if duration else None,
+        sample_rate=int(stream['sample_rate']) if stream.get('sample_rate') else None,
+        channels=stream.get('channels'),
+        codec=stream.get('codec_name'),
+    )
@@ -1,31 +1,123 @@
+import base64
+import binascii
+import json
 from collections.abc import Callable
+from datetime import datetime
+from enum import Enum
 from math import ceil
-from sqlalchemy import func
-from sqlalchemy.orm import Session, Query
+from typing import Any
+from uuid import UUID
 
+from fastapi import HTTPException, status
+from sqlalchemy import Select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.entities.types.enums.ordering import Ordering
 from app.entities.types.pagination import Paginated, PaginationMeta
 
 
-def paginate_query[T, R](
-    db: Session,
-    query: Query[T],
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _load(column: InstrumentedAttribute[Any], value: Any) -> Any:
+    if value is None:
+        return None
+    kind = column.type.python_type
+    if kind is datetime:
+        return datetime.fromisoformat(value)
+    if kind is UUID or issubclass(kind, Enum):
+        return kind(value)
+    return value
+
+
+def encode_cursor(
+    column: InstrumentedAttribute[Any],
+    tiebreak: InstrumentedAttribute[Any],
+    row: Any,
+) -> str:
+    payload = [
+        column.key,
+        _dump(getattr(row, column.key)),
+        _dump(getattr(row, tiebreak.key)),
+    ]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(
+    cursor: str,
+    column: InstrumentedAttribute[Any],
+    tiebreak: InstrumentedAttribute[Any],
+) -> tuple[Any, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        key, value, last = json.loads(raw)
+        if key != column.key:
+            raise ValueError(f'Cursor was issued for sorting by {key}')
+        return _load(column, value), _load(tiebreak, last)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, 'Invalid cursor') from e
+
+
+async def paginate_query[T, R](
+    db: AsyncSession,
+    query: Select[tuple[T]],
+    sort: InstrumentedAttribute[Any],
+    order: Ordering,
+    tiebreak: InstrumentedAttribute[Any],
     limit: int = 20,
     page: int = 1,
+    cursor: str | None = None,
     *,
+    with_total: bool | None = None,
     mapper: Callable[[T], R] = lambda x: x,
 ) -> Paginated[R]:
-    total_items: int = db.query(func.count()).select_from(
-        query.subquery()).scalar() or 0
-    offset = (page - 1) * limit
-    total_page: int = ceil(total_items / limit) if total_items else 1
+    """Keyset pagination over `sort`, with `tiebreak` making the order total.
+
+    Without a cursor `page` is honoured with an offset for older clients.
+    The total is counted on the first page only unless `with_total` says
+    otherwise, so following `next_cursor` never re-counts or skips rows.
+    """
+    if with_total is None:
+        with_total = cursor is None
+
+    total_items: int | None = None
+    total_page: int | None = None
+    if with_total:
+        total_items = await db.scalar(
+            query.with_only_columns(func.count(), maintain_column_froms=True)
+            .order_by(None)
+        ) or 0
+        total_page = ceil(total_items / limit) if total_items else 1
+
+    page_query = order.apply(query, sort, tiebreak)
+    if cursor is not None:
+        value, last = decode_cursor(cursor, sort, tiebreak)
+        page_query = page_query.where(order.after(sort, tiebreak, value, last))
+    elif page > 1:
+        page_query = page_query.offset((page - 1) * limit)
 
-    data: list[T] = query.offset(offset).limit(limit).all()
+    # One extra row tells whether there is a next page
+    data = list((await db.scalars(page_query.limit(limit + 1))).all())
+    next_cursor: str | None = None
+    if len(data) > limit:
+        data = data[:limit]
+        next_cursor = encode_cursor(sort, tiebreak, data[-1])
 
     pagination_meta: PaginationMeta = {
         'limit': limit,
         'page': page,
         'total_pages': total_page,
         'total_items': total_items,
+        'next_cursor': next_cursor,
     }
 
     return {
@@ -0,0 +1,57 @@
+import asyncio
+import logging
+import signal
+import sys
+
+from app.core import logger
+from app.core.config import Config
+from app.core.handlers.log_handlers.telegram import TelegramLogHandler
+from app.core.lifespan import close_repositories, init_event_bus, init_repositories
+from app.shared.services.event_manager import EventManager
+from app.shared.services.metadata_exporter import register_exporters
+from app.shared.services.project_processor import ProjectProcessor
+
+
+async def run() -> None:
+    _logger = logger.get()
+    init_repositories()
+    register_exporters()
+    # Workers only publish, the web processes stream events to clients
+    await init_event_bus(listen=False)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    ProjectProcessor.restart()
+    _logger.info(f'Worker {ProjectProcessor.worker_id} started')
+
+    await stop.wait()
+
+    await ProjectProcessor.exit()
+    await EventManager.close()
+    await close_repositories()
+    _logger.warning(f'Worker {ProjectProcessor.worker_id} shut down')
+
+
+def main():
+    logging.basicConfig(
+        level=Config.LOG_LEVEL,
+        format='%(asctime)s %(levelname)s %(message)s',
+    )
+    logger.add_handler(TelegramLogHandler(level=logging.WARNING))
+
+    if Config.EVENT_BUS != 'postgres':
+        logger.get().warning(
+            'EVENT_BUS is not "postgres", progress will not reach web processes'
+        )
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+"""Listing latency on a large project: offset vs cursor pages, search, filters.
+
+Seeds one project with `--files` audio files for an existing auth user and
+times the repository calls behind GET /v1/project and
+GET /v1/project/{id}/files. Needs a database with the migrations applied,
+reached through SUPABASE_SESSION_POOLER. The seeded project is deleted at
+the end unless --keep is given, and --project-id reuses a kept one.
+
+    uv run python -m benchmarks.listing --user-id <uuid> --files 100000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+# Config reads these at import time, only the database has to be real
+for key, value in {
+    'LOG_LEVEL': 'WARNING',
+    'CORS_ORIGINS': 'http://localhost',
+    'ASR_SERVICE_URL': 'http://localhost:9000',
+    'JWT_SECRET': 'bench',
+    'SUPABASE_URL': 'http://localhost:54321',
+    'SUPABASE_JWT_KEY': 'bench',
+    'SUPABASE_ANON_KEY': 'bench',
+    'SUPABASE_SERVICE_ROLE': 'bench',
+    'SUPABASE_STORAGE_URL': 'http://localhost:54321/storage/v1/s3',
+    'SUPABASE_STORAGE_KEY_ID': 'bench',
+    'SUPABASE_STORAGE_SECRET': 'bench',
+    'SUPABASE_STORAGE_BUCKET_NAME': 'audio_files',
+}.items():
+    os.environ.setdefault(key, value)
+
+from sqlalchemy import delete, insert, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from app.core.database import Database  # noqa: E402
+from app.entities.models.audio_file import AudioFileTable  # noqa: E402
+from app.entities.models.project import ProjectTable  # noqa: E402
+from app.entities.repositories.file.supabase import SupabaseAudioFileRepo  # noqa: E402
+from app.entities.repositories.project.supabase import SupabaseProjectRepo  # noqa: E402
+from app.entities.schemas.params.listing.audio_file import AudioFileListingParams  # noqa: E402
+from app.entities.schemas.params.listing.project import ProjectListingParams  # noqa: E402
+from app.entities.types.enums.ordering import Ordering  # noqa: E402
+from app.entities.types.enums.processing_status import ProcessingStatus  # noqa: E402
+from app.entities.types.enums.sorting import AudioFileSorting, ProjectSorting  # noqa: E402
+from app.shared.utils.query import encode_cursor  # noqa: E402
+
+SEED_BATCH = 5_000
+STATUSES = (ProcessingStatus.pending, ProcessingStatus.completed, ProcessingStatus.error)
+FORMATS = ('wav', 'mp3', 'flac', 'ogg')
+
+files_repo = SupabaseAudioFileRepo()
+projects_repo = SupabaseProjectRepo()
+
+
+async def seed(user_id: uuid.UUID, count: int) -> uuid.UUID:
+    project_id = uuid.uuid4()
+    now = datetime.now(UTC)
+    rng = random.Random(project_id.int)
+
+    async with Database.session() as db:
+        db.add(
+            ProjectTable(
+                id=project_id,
+                name=f'listing bench {project_id.hex[:8]}',
+                status=ProcessingStatus.completed,
+                progress=1.0,
+                project_path=str(project_id),
+                created_at=now,
+                updated_at=now,
+                created_by=user_id,
+            )
+        )
+        await db.commit()
+
+        try:
+            t0 = time.perf_counter()
+            await seed_files(db, project_id, user_id, count, now, rng)
+        except BaseException:
+            # Don't leave a half seeded project behind
+            await db.rollback()
+            await db.execute(delete(ProjectTable).where(ProjectTable.id == project_id))
+            await db.commit()
+            raise
+
+    print(f'seeded {count} files in {time.perf_counter() - t0:.1f}s, project {project_id}')
+    return project_id
+
+
+async def seed_files(
+    db: AsyncSession,
+    project_id: uuid.UUID,
+    user_id: uuid.UUID,
+    count: int,
+    now: datetime,
+    rng: random.Random,
+) -> None:
+    """Insert `count` files in batches, timestamps are aware like the app's"""
+    for start in range(0, count, SEED_BATCH):
+        rows: list[dict[str, Any]] = []
+        for i in range(start, min(start + SEED_BATCH, count)):
+            name = f'file_{i:06}.{FORMATS[i % len(FORMATS)]}'
+            status = STATUSES[i % len(STATUSES)]
+            created = now - timedelta(seconds=count - i)
+            rows.append({
+                'id': uuid.uuid4(),
+                'project_id': project_id,
+                'file_name': name,
+                'file_path_raw': f'{project_id}/raw/{name}',
+                'file_size': rng.randint(10_000, 50_000_000),
+                # Some NULLs so nullable sort columns are exercised
+                'duration': None if i % 50 == 0 else rng.randint(500, 600_000),
+                'format': FORMATS[i % len(FORMATS)],
+                'transcription_status': status,
+                'transcription_content': (
+                    f'transcript {i}' if status == ProcessingStatus.completed else None
+                ),
+                'created_at': created,
+                'updated_at': created,
+                'created_by': user_id,
+            })
+        await db.execute(insert(AudioFileTable), rows)
+        await db.commit()
+    # Fresh statistics, as autovacuum would eventually provide
+    await db.execute(text('analyze public.audio_files'))
+    await db.commit()
+
+
+async def cursor_at(
+    db: AsyncSession,
+    project_id: uuid.UUID,
+    sort: AudioFileSorting,
+    order: Ordering,
+    offset: int,
+) -> str:
+    """The cursor a client would hold after paging to `offset`"""
+    query = select(AudioFileTable).where(AudioFileTable.project_id == project_id)
+    query = order.apply(query, sort.column(), AudioFileTable.id)
+    row = await db.scalar(query.offset(offset - 1).limit(1))
+    return encode_cursor(sort.column(), AudioFileTable.id, row)
+
+
+async def timed(
+    label: str,
+    repeat: int,
+    call: Callable[[AsyncSession], Awaitable[Any]],
+) -> None:
+    samples: list[float] = []
+    rows = 0
+    for _ in range(repeat):
+        async with Database.session() as db:
+            t0 = time.perf_counter()
+            result = await call(db)
+            samples.append((time.perf_counter() - t0) * 1000)
+            rows = len(result['data'])
+
+    print(
+        f'{label:<44} {statistics.median(samples):>9.2f} ms  '
+        f'(min {min(samples):.2f}, {rows} rows)'
+    )
+
+
+def file_params(
+    sort: AudioFileSorting,
+    limit: int,
+    *,
+    page: int = 1,
+    cursor: str | None = None,
+    name: str = '',
+    status: ProcessingStatus | None = None,
+) -> AudioFileListingParams:
+    return AudioFileListingParams(
+        limit=limit,
+        page=page,
+        cursor=cursor,
+        with_total=None,
+        file_name=name,
+        status=status,
+        sort=sort,
+        order=Ordering.desc,
+    )
+
+
+async def bench_files(
+    user_id: uuid.UUID, project_id: uuid.UUID, count: int, limit: int, repeat: int
+) -> None:
+    page = max(count // limit // 2, 1)
+    print(f'\nfiles: limit {limit}, deep page {page} (offset {(page - 1) * limit})')
+
+    for sort in AudioFileSorting:
+        async with Database.session() as db:
+            cursor = await cursor_at(
+                db, project_id, sort, Ordering.desc, (page - 1) * limit
+            ) if page > 1 else None
+
+        await timed(
+            f'{sort} first page + count', repeat,
+            lambda db: files_repo.get_files_for_project(
+                db, project_id, user_id, file_params(sort, limit)
+            ),
+        )
+        await timed(
+            f'{sort} page {page} by offset', repeat,
+            lambda db: files_repo.get_files_for_project(
+                db, project_id, user_id, file_params(sort, limit, page=page)
+            ),
+        )
+        await timed(
+            f'{sort} page {page} by cursor', repeat,
+            lambda db: files_repo.get_files_for_project(
+                db, project_id, user_id, file_params(sort, limit, cursor=cursor)
+            ),
+        )
+
+    await timed(
+        'search "file_0421"', repeat,
+        lambda db: files_repo.get_files_for_project(
+            db, project_id, user_id,
+            file_params(AudioFileSorting.file_name, limit, name='file_0421'),
+        ),
+    )
+    await timed(
+        'search "999"', repeat,
+        lambda db: files_repo.get_files_for_project(
+            db, project_id, user_id,
+            file_params(AudioFileSorting.file_name, limit, name='999'),
+        ),
+    )
+    await timed(
+        'status completed', repeat,
+        lambda db: files_repo.get_files_for_project(
+            db, project_id, user_id,
+            file_params(
+                AudioFileSorting.updated_at, limit, status=ProcessingStatus.completed
+            ),
+        ),
+    )
+
+
+async def bench_projects(user_id: uuid.UUID, repeat: int) -> None:
+    print('\nprojects')
+    for sort in ProjectSorting:
+        await timed(
+            f'{sort} first page + count', repeat,
+            lambda db: projects_repo.get_all_projects_for_user(
+                db, user_id,
+                ProjectListingParams(
+                    limit=20, page=1, cursor=None, with_total=None,
+                    project_name='', status=None, sort=sort, order=Ordering.desc,
+                ),
+            ),
+        )
+    await timed(
+        'search "bench"', repeat,
+        lambda db: projects_repo.get_all_projects_for_user(
+            db, user_id,
+            ProjectListingParams(
+                limit=20, page=1, cursor=None, with_total=None,
+                project_name='bench', status=None,
+                sort=ProjectSorting.updated_at, order=Ordering.desc,
+            ),
+        ),
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    Database.init()
+    user_id = uuid.UUID(args.user_id)
+    project_id = (
+        uuid.UUID(args.project_id) if args.project_id
+        else await seed(user_id, args.files)
+    )
+
+    try:
+        await bench_files(user_id, project_id, args.files, args.limit, args.repeat)
+        await bench_projects(user_id, args.repeat)
+    finally:
+        if not args.keep and not args.project_id:
+            async with Database.session() as db:
+                await db.execute(delete(ProjectTable).where(ProjectTable.id == project_id))
+                await db.commit()
+        await Database.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--user-id', required=True, help='existing auth.users id')
+    parser.add_argument('--files', type=int, default=100_000)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--project-id', help='reuse a project seeded with --keep')
+    parser.add_argument('--keep', action='store_true')
+    asyncio.run(main(parser.parse_args()))
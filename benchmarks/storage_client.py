@@ -0,0 +1,84 @@
+"""Allocation per file listing: a storage client per call vs the shared one.
+
+Simulates `get_files` building public URLs for a page of files, first the
+way it used to (`supabase.create_client` per file, with its own auth and
+storage HTTP clients) and then through the single instance created in
+lifespan. Every client is closed, the old call sites never did.
+
+    uv run python -m benchmarks.storage_client --page-size 1000
+"""
+import argparse
+import asyncio
+import os
+import time
+import tracemalloc
+from collections.abc import Callable
+
+# Config reads these at import time, values only need to be well formed
+for key, value in {
+    'LOG_LEVEL': 'WARNING',
+    'CORS_ORIGINS': 'http://localhost',
+    'ASR_SERVICE_URL': 'http://localhost:9000',
+    'JWT_SECRET': 'bench',
+    'SUPABASE_URL': 'http://localhost:54321',
+    'SUPABASE_JWT_KEY': 'bench',
+    'SUPABASE_ANON_KEY': 'bench',
+    'SUPABASE_SERVICE_ROLE': 'bench',
+    'SUPABASE_SESSION_POOLER': 'postgresql://localhost/bench',
+    'SUPABASE_STORAGE_URL': 'http://localhost:54321/storage/v1/s3',
+    'SUPABASE_STORAGE_KEY_ID': 'bench',
+    'SUPABASE_STORAGE_SECRET': 'bench',
+    'SUPABASE_STORAGE_BUCKET_NAME': 'audio_files',
+}.items():
+    os.environ.setdefault(key, value)
+
+from supabase import create_client  # noqa: E402
+
+from app.core.config import Config  # noqa: E402
+from app.entities.repositories.sss.supabase import SupabaseSSSRepo  # noqa: E402
+
+
+def per_call_url(path: str) -> str:
+    """The pre-lifespan path, SupabaseSSSRepo() wrapped create_client"""
+    client = create_client(Config.Supabase.URL, Config.Supabase.SERVICE_ROLE)
+    try:
+        with client.storage as storage:
+            bucket = storage.from_(Config.Supabase.STORAGE_BUCKET_NAME)
+            return bucket.get_public_url(path)
+    finally:
+        # auth.close() calls aclose() on its sync client in supabase-auth 2.22
+        client.auth._http_client.close()
+
+
+def measure(name: str, page_size: int, get_url: Callable[[str], str]) -> None:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    for i in range(page_size):
+        get_url(f'project/raw/file_{i:05}.wav')
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f'{name:<10} {elapsed * 1000:>9.2f} ms  '
+        f'{peak / 1024:>10.1f} KiB peak  '
+        f'{elapsed * 1e6 / page_size:>8.1f} us/file'
+    )
+
+
+async def main(page_size: int) -> None:
+    print(f'page size {page_size}')
+
+    measure('per call', page_size, per_call_url)
+
+    shared = SupabaseSSSRepo()
+    try:
+        measure('shared', page_size, shared.get_public_url)
+    finally:
+        await shared.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--page-size', type=int, default=1000)
+    asyncio.run(main(parser.parse_args().page_size))
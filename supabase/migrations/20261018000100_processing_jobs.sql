@@ -0,0 +1,29 @@
+-- Durable processing queue leased by project processors.
+
+create type jobstatus as enum ('queued', 'leased', 'completed', 'failed');
+
+create table if not exists public.processing_jobs (
+    id uuid primary key default gen_random_uuid(),
+    project_id uuid not null references public.projects (id) on delete cascade,
+    created_by uuid not null references auth.users (id) on delete cascade,
+    status jobstatus not null default 'queued',
+    lease_owner text,
+    lease_expires_at timestamptz,
+    heartbeat_at timestamptz,
+    attempts integer not null default 0,
+    last_error text,
+    created_at timestamptz not null default now(),
+    updated_at timestamptz not null default now()
+);
+
+-- At most one live job per project.
+create unique index if not exists processing_jobs_active_project_idx
+    on public.processing_jobs (project_id)
+    where status in ('queued', 'leased');
+
+create index if not exists processing_jobs_status_created_at_idx
+    on public.processing_jobs (status, created_at);
+
+create index if not exists processing_jobs_lease_expires_at_idx
+    on public.processing_jobs (lease_expires_at)
+    where status = 'leased';
@@ -0,0 +1,3 @@
+-- Content hash of the stored audio, used to reuse transcriptions of duplicates.
+
+alter table public.audio_files add column if not exists content_hash text;
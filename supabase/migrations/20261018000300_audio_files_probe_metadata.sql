@@ -0,0 +1,6 @@
+-- Stream metadata probed once at ingest so later stages never re-read headers.
+
+alter table public.audio_files
+    add column if not exists sample_rate integer,
+    add column if not exists channels smallint,
+    add column if not exists codec text;
@@ -0,0 +1,4 @@
+-- Version of a project's files and transcriptions, used to key cached exports.
+
+alter table public.projects
+    add column if not exists content_version integer not null default 0;
@@ -0,0 +1,40 @@
+-- Indexes for project and file listings.
+-- (owner, <sort column>, id) matches the keyset order used by paginate_query,
+-- in both directions, and the trigram indexes serve substring name search.
+
+create extension if not exists pg_trgm with schema extensions;
+
+create index if not exists audio_files_project_file_name_idx
+    on public.audio_files (project_id, file_name, id);
+create index if not exists audio_files_project_status_idx
+    on public.audio_files (project_id, transcription_status, id);
+create index if not exists audio_files_project_created_at_idx
+    on public.audio_files (project_id, created_at, id);
+create index if not exists audio_files_project_updated_at_idx
+    on public.audio_files (project_id, updated_at, id);
+create index if not exists audio_files_project_file_size_idx
+    on public.audio_files (project_id, file_size, id);
+create index if not exists audio_files_project_duration_idx
+    on public.audio_files (project_id, duration, id);
+create index if not exists audio_files_project_format_idx
+    on public.audio_files (project_id, format, id);
+
+create index if not exists audio_files_file_name_trgm_idx
+    on public.audio_files using gin (lower(file_name) extensions.gin_trgm_ops);
+
+create index if not exists projects_created_by_name_idx
+    on public.projects (created_by, name, id);
+create index if not exists projects_created_by_status_idx
+    on public.projects (created_by, status, id);
+create index if not exists projects_created_by_progress_idx
+    on public.projects (created_by, progress, id);
+create index if not exists projects_created_by_created_at_idx
+    on public.projects (created_by, created_at, id);
+create index if not exists projects_created_by_updated_at_idx
+    on public.projects (created_by, updated_at, id);
+
+create index if not exists projects_name_trgm_idx
+    on public.projects using gin (lower(name) extensions.gin_trgm_ops);
+
+analyze public.audio_files;
+analyze public.projects;
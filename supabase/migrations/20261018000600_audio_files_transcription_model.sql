@@ -0,0 +1,8 @@
+-- ASR model behind transcription_content, NULL for hand-written transcripts.
+-- Completed rows double as a transcription cache for identical audio.
+
+alter table public.audio_files add column if not exists transcription_model text;
+
+create index if not exists audio_files_content_hash_model_idx
+    on public.audio_files (content_hash, transcription_model)
+    where transcription_status = 'completed';
@@ -0,0 +1,45 @@
+"""Needs a Postgres reachable through TEST_DATABASE_URL, skipped otherwise.
+
+    TEST_DATABASE_URL=postgresql://... uv run --with pytest pytest tests
+"""
+import asyncio
+import os
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.entities.models.__base__ import Base
+
+DATABASE_URL = os.environ.get('TEST_DATABASE_URL')
+
+
+class _Stamp(Base):
+    __tablename__ = 'timestamp_roundtrip'
+    __table_args__ = {'prefixes': ['TEMPORARY']}
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    at: Mapped[datetime]
+
+
+@pytest.mark.skipif(DATABASE_URL is None, reason='TEST_DATABASE_URL not set')
+def test_aware_datetime_round_trips_through_asyncpg() -> None:
+    async def run() -> datetime | None:
+        assert DATABASE_URL is not None
+        engine = create_async_engine(
+            make_url(DATABASE_URL).set(drivername='postgresql+asyncpg')
+        )
+        try:
+            # Temporary tables live on one connection
+            async with engine.connect() as conn:
+                await conn.run_sync(_Stamp.__table__.create)
+                await conn.execute(insert(_Stamp).values(id=1, at=now))
+                return await conn.scalar(select(_Stamp.at))
+        finally:
+            await engine.dispose()
+
+    now = datetime.now(UTC)
+    assert asyncio.run(run()) == now